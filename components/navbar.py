@@ -1,25 +1,68 @@
 import flet as ft
 
+ADMIN_ROUTES = ("/admin", "/user_activity", "/audit_logs", "/settings")
+USER_ROUTES = ("/dashboard", "/tasks", "/time_it", "/analytics", "/settings")
+
+NAVBAR_BGCOLOR = "#F6F4F1"
+NAVBAR_PADDING = ft.padding.only(left=10, right=10, top=4, bottom=6)
+
+# (active, inactive) colors for nav item badge background, badge text and label
+BADGE_BGCOLORS = ("#C9D8E8", "#E7EAEE")
+BADGE_TEXT_COLORS = ("#233142", "#7C8794")
+LABEL_COLORS = ("#2E3135", "#6D737A")
+
+
 def create_navbar(page: ft.Page, current_route: str, session: dict, route_change: callable):
-    """Create bottom mobile navigation bar."""
-        
-    def navigate_to(route):
-        """Navigate to a specific route"""
-        page.route = route
-        route_change(route)
-    
-    def is_active(route):
-        return current_route == route or (route == "/tasks" and current_route.startswith("/tasks/"))
+    """
+    Create bottom mobile navigation bar.
 
+    The navbar is built once per session and reused on later calls; only the
+    active-tab styling and the admin/user item visibility are patched in place.
+    """
+    navbar = session.get("navbar")
+    if navbar is None:
+        navbar = _build_navbar(page, route_change)
+        session["navbar"] = navbar
+
+    refresh_navbar(navbar, current_route, session)
+    return navbar
+
+
+def refresh_navbar(navbar: ft.Container, current_route: str, session: dict):
+    """Restyle the cached navbar for the current route and user role."""
     user = session.get("user")
-    is_admin = user and user.role == "admin"
+    is_admin = bool(user and user.role == "admin")
+    visible_routes = ADMIN_ROUTES if is_admin else USER_ROUTES
 
-    def nav_item(label: str, badge: str, route: str, center: bool = False):
-        active = is_active(route)
-        badge_bg = "#C9D8E8" if active else "#E7EAEE"
-        badge_text = "#233142" if active else "#7C8794"
-        label_color = "#2E3135" if active else "#6D737A"
+    for item in navbar.content.controls:
+        route = item.data
+        item.visible = route in visible_routes
+        _style_nav_item(item, _is_active(current_route, route))
 
+
+def _is_active(current_route: str, route: str) -> bool:
+    return current_route == route or (route == "/tasks" and current_route.startswith("/tasks/"))
+
+
+def _style_nav_item(item: ft.Container, active: bool):
+    """Apply active/inactive colors to a nav item built by _nav_item."""
+    badge_box, _, label_text = item.content.controls
+    idx = 0 if active else 1
+    badge_box.bgcolor = BADGE_BGCOLORS[idx]
+    badge_box.content.color = BADGE_TEXT_COLORS[idx]
+    label_text.color = LABEL_COLORS[idx]
+    if item.data == "/time_it":
+        label_text.weight = ft.FontWeight.W_700 if active else ft.FontWeight.W_600
+
+
+def _build_navbar(page: ft.Page, route_change: callable) -> ft.Container:
+    def on_nav(e):
+        """Navigate to the route stored on the clicked nav item"""
+        route = e.control.data
+        page.route = route
+        route_change(route)
+
+    def nav_item(label: str, badge: str, route: str, center: bool = False):
         if center:
             return ft.Container(
                 content=ft.Column(
@@ -29,28 +72,26 @@ def create_navbar(page: ft.Page, current_route: str, session: dict, route_change
                                 badge,
                                 size=10,
                                 weight=ft.FontWeight.W_700,
-                                color=badge_text,
                                 text_align=ft.TextAlign.CENTER,
                             ),
                             width=30,
                             height=24,
                             border_radius=8,
-                            bgcolor=badge_bg,
                             alignment=ft.alignment.center,
                         ),
                         ft.Container(height=4),
                         ft.Text(
                             label,
                             size=11,
-                            weight=ft.FontWeight.W_700 if active else ft.FontWeight.W_600,
-                            color=label_color,
+                            weight=ft.FontWeight.W_600,
                             text_align=ft.TextAlign.CENTER,
                         ),
                     ],
                     spacing=0,
                     horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                 ),
-                on_click=lambda e: navigate_to(route),
+                data=route,
+                on_click=on_nav,
                 ink=True,
                 expand=True,
             )
@@ -63,46 +104,40 @@ def create_navbar(page: ft.Page, current_route: str, session: dict, route_change
                             badge,
                             size=10,
                             weight=ft.FontWeight.W_700,
-                            color=badge_text,
                             text_align=ft.TextAlign.CENTER,
                         ),
                         width=28,
                         height=22,
                         border_radius=7,
-                        bgcolor=badge_bg,
                         alignment=ft.alignment.center,
                     ),
                     ft.Container(height=4),
                     ft.Text(
                         label,
                         size=10,
-                        color=label_color,
                         text_align=ft.TextAlign.CENTER,
                     ),
                 ],
                 spacing=0,
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
             ),
-            on_click=lambda e: navigate_to(route),
+            data=route,
+            on_click=on_nav,
             ink=True,
             expand=True,
         )
 
-    if is_admin:
-        nav_controls = [
-            nav_item("Admin", "AD", "/admin"),
-            nav_item("Activity", "AC", "/user_activity"),
-            nav_item("Audit", "AU", "/audit_logs"),
-            nav_item("Account", "ME", "/settings"),
-        ]
-    else:
-        nav_controls = [
-            nav_item("Home", "HM", "/dashboard"),
-            nav_item("Tasks", "TK", "/tasks"),
-            nav_item("Time It!", "TI", "/time_it", center=True),
-            nav_item("Analytics", "AN", "/analytics"),
-            nav_item("Account", "ME", "/settings"),
-        ]
+    # Admin and user items live in one row; refresh_navbar toggles visibility.
+    nav_controls = [
+        nav_item("Admin", "AD", "/admin"),
+        nav_item("Activity", "AC", "/user_activity"),
+        nav_item("Audit", "AU", "/audit_logs"),
+        nav_item("Home", "HM", "/dashboard"),
+        nav_item("Tasks", "TK", "/tasks"),
+        nav_item("Time It!", "TI", "/time_it", center=True),
+        nav_item("Analytics", "AN", "/analytics"),
+        nav_item("Account", "ME", "/settings"),
+    ]
 
     navbar = ft.Container(
         content=ft.Row(
@@ -110,8 +145,8 @@ def create_navbar(page: ft.Page, current_route: str, session: dict, route_change
             alignment=ft.MainAxisAlignment.SPACE_AROUND,
             vertical_alignment=ft.CrossAxisAlignment.CENTER,
         ),
-        bgcolor="#F6F4F1",
-        padding=ft.padding.only(left=10, right=10, top=4, bottom=6),
+        bgcolor=NAVBAR_BGCOLOR,
+        padding=NAVBAR_PADDING,
     )
-    
+
     return navbar
@@ -2,7 +2,7 @@ import os
 import time
 from dotenv import load_dotenv
 import flet as ft
-from components.navbar import create_navbar
+from components.navbar import create_navbar, refresh_navbar
 from views.dashboard import DashboardPage
 from views.login import LoginPage
 from views.tasks import TasksPage
@@ -15,6 +15,33 @@ from views.analytics import AnalyticsPage
 from views.audit_logs import AuditLogsPage
 from views.user_activity import UserActivityPage
 
+def _tasks_page(page: ft.Page, session: dict):
+    session["task_details_create_mode"] = False
+    return TasksPage(page, session)
+
+
+def _new_task_page(page: ft.Page, session: dict):
+    session["task_details_create_mode"] = True
+    session["selected_task_id"] = None
+    return TaskDetailsPage(page, session)
+
+
+# Routes whose page only needs (page, session). Pages are built fresh on
+# every visit because they read the current data when constructed.
+ROUTES = {
+    "/tasks": _tasks_page,
+    "/tasks/new": _new_task_page,
+    "/": DashboardPage,
+    "/dashboard": DashboardPage,
+    "/time_it": TimeItPage,
+    "/settings": SettingsPage,
+    "/admin": AdminPage,
+    "/audit_logs": AuditLogsPage,
+    "/user_activity": UserActivityPage,
+    "/analytics": AnalyticsPage,
+    "/login": LoginPage,
+}
+
 def main(page: ft.Page):
     """
     TYMATE - Time-Aware School Activity Tracker
@@ -42,7 +69,7 @@ def main(page: ft.Page):
 
     # Persistent container that holds the current page content
     main_content = ft.Container(expand=True)
-    
+
     # Navigation function to switch between pages
     def route_change(route: str, bypass_time_it_guard: bool = False):
         """Handle route changes"""
@@ -50,14 +77,10 @@ def main(page: ft.Page):
         target_route = route
 
         leaving_time_it = current_route == "/time_it" and target_route != "/time_it"
-        timer_actively_running = (
-            callable(session.get("time_it_is_timer_running"))
-            and session["time_it_is_timer_running"]()
-        )
-        has_active_progress = (
-            callable(session.get("time_it_has_active_progress"))
-            and session["time_it_has_active_progress"]()
-        )
+        is_timer_running = session.get("time_it_is_timer_running")
+        timer_actively_running = callable(is_timer_running) and is_timer_running()
+        has_progress = session.get("time_it_has_active_progress")
+        has_active_progress = callable(has_progress) and has_progress()
 
         if (
             not bypass_time_it_guard
@@ -104,32 +127,22 @@ def main(page: ft.Page):
             if callable(session.get("time_it_cleanup")):
                 session["time_it_cleanup"](preserve_progress=True)
         
-        # Special case: If user needs onboarding, redirect
+        # Special case: If user needs onboarding, render onboarding in place
+        # of the requested route instead of re-entering route_change
         if not session["onboarding_completed"] and page.route not in ("/onboarding", "/login", "/admin", "/settings"):
             page.route = "/onboarding"
-            return route_change("/onboarding")
         
-        # Clear and rebuild
-        page.controls.clear()
         session["route_change"] = route_change
-        
-        page.add(main_content)
 
         # Don't show navbar on login or onboarding pages
-        if page.route not in ("/login", "/onboarding"):
-            navbar = create_navbar(page, page.route, session, route_change)
-            page.add(navbar)
+        navbar.visible = page.route not in ("/login", "/onboarding")
+        if navbar.visible:
+            refresh_navbar(navbar, page.route, session)
         
         # Swap content inside main_content without removing navbar
-        if page.route in ("/", "/dashboard"):
-            main_content.content = DashboardPage(page, session)   # returns a Container
-        elif page.route == "/tasks":
-            session["task_details_create_mode"] = False
-            main_content.content = TasksPage(page, session)
-        elif page.route == "/tasks/new":
-            session["task_details_create_mode"] = True
-            session["selected_task_id"] = None
-            main_content.content = TaskDetailsPage(page, session)
+        page_cls = ROUTES.get(page.route)
+        if page_cls is not None:
+            main_content.content = page_cls(page, session)
         elif page.route.startswith("/tasks/"):
             session["task_details_create_mode"] = False
             try:
@@ -137,20 +150,6 @@ def main(page: ft.Page):
                 main_content.content = TaskDetailsPage(page, session)
             except (TypeError, ValueError):
                 main_content.content = TasksPage(page, session)
-        elif page.route == "/time_it":
-            main_content.content = TimeItPage(page, session)
-        elif page.route == "/settings":
-            main_content.content = SettingsPage(page, session)
-        elif page.route == "/admin":
-            main_content.content = AdminPage(page, session)
-        elif page.route == "/audit_logs":
-            main_content.content = AuditLogsPage(page, session)
-        elif page.route == "/user_activity":
-            main_content.content = UserActivityPage(page, session)
-        elif page.route == "/analytics":
-            main_content.content = AnalyticsPage(page, session)
-        elif page.route == "/login":
-            main_content.content = LoginPage(page, session)
         elif page.route == "/onboarding":
             def on_onboarding_complete(data, budget):
                 """Called when onboarding is finished"""
@@ -183,10 +182,21 @@ def main(page: ft.Page):
         session["current_route"] = page.route
         page.update()
     
+    # Navbar and content container are added once; route changes only swap
+    # main_content.content and restyle the navbar in place. They are sent to
+    # the client by the initial route_change's page.update() below.
+    navbar = create_navbar(page, page.route, session, route_change)
+    navbar.visible = False
+    page.controls.extend([main_content, navbar])
+
     # Set up route change handler
-    page.on_route_change = lambda e: route_change(page.route)
+    def on_route(e):
+        route_change(page.route)
+
+    page.on_route_change = on_route
     
-    # Start with login route
+    # Start with login route. Assigning page.route does not fire
+    # on_route_change on the server side, so render it explicitly.
     page.route = "/login"
     route_change("/login")
 
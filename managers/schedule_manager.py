@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from datetime import date as date_type, datetime
 from typing import List, Optional
 
@@ -5,15 +6,38 @@ from storage.sqlite import get_database
 from datetime import datetime
 from services import sync_service
 
+# Kept as one constant so sqlite3's per-connection statement cache reuses the
+# compiled statement on every free-time computation.
+_USER_AND_DAY_SCHEDULE_SQL = """
+    SELECT 0 AS row_kind, wake_time, sleep_hours, NULL AS start_time, NULL AS end_time
+    FROM users
+    WHERE id = ?
+    UNION ALL
+    SELECT 1 AS row_kind, NULL, NULL, start_time, end_time
+    FROM class_schedule
+    WHERE user_id = ? AND day_of_week = ?
+    ORDER BY row_kind, start_time
+"""
+
 
 class ScheduleManager:
     """CRUD operations and free-time computation for class/work schedules."""
 
     BASIC_NEEDS_BUFFER_MINUTES = 90
+    FREE_TIME_CACHE_SIZE = 128
+
+    # Shared across instances: views create a new manager on every build.
+    # Maps (db_path, user_id, date, db change count) -> free minutes.
+    _free_time_cache: OrderedDict = OrderedDict()
 
     def __init__(self):
         self.db = get_database()
 
+    def _data_version(self) -> Optional[int]:
+        """Rows changed on the shared connection so far; any write bumps it"""
+        connection = getattr(self.db, "connection", None)
+        return getattr(connection, "total_changes", None)
+
     def add_class_block(
         self,
         user_id: int,
@@ -82,7 +106,7 @@ class ScheduleManager:
         """Delete a class block by ID."""
         try:
             # Fetch record to determine user_id for syncing
-            record = self.db.fetch_one("SELECT * FROM class_schedule WHERE id = ?", (block_id,))
+            record = self.db.fetch_one("SELECT user_id FROM class_schedule WHERE id = ?", (block_id,))
             deleted = self.db.delete("class_schedule", "id = ?", (block_id,))
             if deleted == 0:
                 return False, "Class block not found"
@@ -111,18 +135,23 @@ class ScheduleManager:
         - Compute total awake minutes for the day
         - Subtract class block minutes for that weekday
         - Subtract a fixed 90-minute basic-needs buffer
+
+        Results are reused until any row in the database changes. That covers
+        class blocks as well as the users row holding wake_time/sleep_hours.
         """
         target_date = self._normalize_date(date)
+        version = self._data_version()
+        cache_key = None
+        if isinstance(version, int):
+            cache_key = (self.db.db_path, user_id, target_date, version)
+            cached = self._free_time_cache.get(cache_key)
+            if cached is not None:
+                self._free_time_cache.move_to_end(cache_key)
+                return cached
+
         weekday = target_date.weekday()
 
-        user = self.db.fetch_one(
-            """
-            SELECT wake_time, sleep_hours
-            FROM users
-            WHERE id = ?
-            """,
-            (user_id,),
-        )
+        user, class_blocks = self._get_user_and_day_schedule(user_id, weekday)
 
         wake_time = user["wake_time"] if user and user.get("wake_time") else "07:00"
         sleep_hours = float(user["sleep_hours"]) if user and user.get("sleep_hours") is not None else 8.0
@@ -131,7 +160,6 @@ class ScheduleManager:
 
         awake_minutes = max(0, int(round((24.0 - sleep_hours) * 60)))
 
-        class_blocks = self.get_classes_for_day(user_id, weekday)
         intervals: list[tuple[int, int]] = []
         for block in class_blocks:
             try:
@@ -145,18 +173,41 @@ class ScheduleManager:
 
             intervals.append((start, end))
 
-        intervals.sort(key=lambda item: item[0])
-        merged: list[list[int]] = []
+        # Sweep sorted intervals, keeping only the current merged run.
+        intervals.sort()
+        class_minutes = 0
+        run_start = run_end = None
         for start, end in intervals:
-            if not merged or start > merged[-1][1]:
-                merged.append([start, end])
-            else:
-                merged[-1][1] = max(merged[-1][1], end)
+            if run_end is None or start > run_end:
+                if run_end is not None:
+                    class_minutes += run_end - run_start
+                run_start, run_end = start, end
+            elif end > run_end:
+                run_end = end
+        if run_end is not None:
+            class_minutes += run_end - run_start
+
+        free_minutes = max(0, awake_minutes - class_minutes - self.BASIC_NEEDS_BUFFER_MINUTES)
 
-        class_minutes = sum(end - start for start, end in merged)
+        if cache_key is not None:
+            cache = self._free_time_cache
+            cache[cache_key] = free_minutes
+            if len(cache) > self.FREE_TIME_CACHE_SIZE:
+                cache.popitem(last=False)
+        return free_minutes
 
-        free_minutes = awake_minutes - class_minutes - self.BASIC_NEEDS_BUFFER_MINUTES
-        return max(0, free_minutes)
+    def _get_user_and_day_schedule(self, user_id: int, day_of_week: int) -> tuple[Optional[dict], List[dict]]:
+        """Fetch the user's wake/sleep row and that day's class blocks in one query."""
+        rows = self.db.fetch_all(_USER_AND_DAY_SCHEDULE_SQL, (user_id, user_id, day_of_week))
+
+        user = None
+        class_blocks = []
+        for row in rows:
+            if row["row_kind"] == 0:
+                user = row
+            else:
+                class_blocks.append(row)
+        return user, class_blocks
 
     def _normalize_date(self, value) -> date_type:
         """Accept datetime/date/ISO date string and return date."""
@@ -170,19 +221,37 @@ class ScheduleManager:
 
     def _parse_time(self, value: str) -> str:
         """Parse HH:MM or HH:MM:SS time strings and normalize to HH:MM."""
+        hours, minutes = self._split_time(value)
+        return f"{hours:02d}:{minutes:02d}"
+
+    def _split_time(self, value: str) -> tuple[int, int]:
+        """Return (hour, minute) from an HH:MM or HH:MM:SS string."""
+        # Fast path: zero-padded values as stored in class_schedule.
+        if (
+            isinstance(value, str)
+            and len(value) in (5, 8)
+            and value[2] == ":"
+            and (len(value) == 5 or value[5] == ":")
+        ):
+            hh, mm = value[0:2], value[3:5]
+            if hh.isdigit() and mm.isdigit() and (len(value) == 5 or value[6:8].isdigit()):
+                hours, minutes = int(hh), int(mm)
+                if hours < 24 and minutes < 60 and (len(value) == 5 or int(value[6:8]) <= 61):
+                    return hours, minutes
+
+        # Slow path keeps strptime's leniency (e.g. single-digit hours).
         for fmt in ("%H:%M", "%H:%M:%S"):
             try:
                 dt = datetime.strptime(value, fmt)
-                return f"{dt.hour:02d}:{dt.minute:02d}"
-            except ValueError:
+                return dt.hour, dt.minute
+            except (ValueError, TypeError):
                 continue
         raise ValueError("Invalid time format")
 
     def _time_to_minutes(self, value: str) -> int:
         """Convert an HH:MM or HH:MM:SS string to absolute minutes from midnight."""
-        normalized = self._parse_time(value)
-        hours, minutes = normalized.split(":")
-        return int(hours) * 60 + int(minutes)
+        hours, minutes = self._split_time(value)
+        return hours * 60 + minutes
 
     def _minutes_between(self, start_time: str, end_time: str) -> int:
         """Compute minutes between two normalized times."""
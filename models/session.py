@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """
     Session data model for task time tracking
@@ -32,25 +32,16 @@ class Session:
 
     def __post_init__(self):
         """Initialize timestamps if not provided"""
-        now = datetime.now().isoformat()
-        if not self.logged_at:
-            self.logged_at = now
-        if not self.created_at:
-            self.created_at = now
+        if not self.logged_at or not self.created_at:
+            now = datetime.now().isoformat()
+            self.logged_at = self.logged_at or now
+            self.created_at = self.created_at or now
 
     def to_dict(self) -> dict:
         """Convert session to dictionary for database storage"""
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "task_id": self.task_id,
-            "duration_minutes": self.duration_minutes,
-            "notes": self.notes,
-            "logged_at": self.logged_at,
-            "created_at": self.created_at,
-            "is_deleted": 1 if self.is_deleted else 0,
-            "deleted_at": self.deleted_at,
-        }
+        data = {k: getattr(self, k) for k in _FIELDS}
+        data["is_deleted"] = 1 if self.is_deleted else 0
+        return data
 
     @classmethod
     def from_dict(cls, data: dict) -> "Session":
@@ -66,3 +57,43 @@ class Session:
             is_deleted=bool(data.get("is_deleted", 0)),
             deleted_at=data.get("deleted_at"),
         )
+
+    @classmethod
+    def _from_row(cls, row: dict) -> "Session":
+        """Build a Session from a task_sessions row, skipping __init__"""
+        # Slots are assigned directly; rows from the database carry their own
+        # timestamps, so only the missing ones fall back to now.
+        session = cls.__new__(cls)
+        session.id = row.get("id")
+        session.user_id = row.get("user_id")
+        session.task_id = row.get("task_id")
+        session.duration_minutes = row.get("duration_minutes")
+        session.notes = row.get("notes")
+        session.logged_at = row.get("logged_at")
+        session.created_at = row.get("created_at")
+        session.is_deleted = bool(row.get("is_deleted"))
+        session.deleted_at = row.get("deleted_at")
+        if not session.logged_at or not session.created_at:
+            now = datetime.now().isoformat()
+            session.logged_at = session.logged_at or now
+            session.created_at = session.created_at or now
+        return session
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict]) -> List["Session"]:
+        """Create Session instances from task_sessions rows in bulk"""
+        from_row = cls._from_row
+        return [from_row(row) for row in rows]
+
+
+_FIELDS = (
+    "id",
+    "user_id",
+    "task_id",
+    "duration_minutes",
+    "notes",
+    "logged_at",
+    "created_at",
+    "is_deleted",
+    "deleted_at",
+)
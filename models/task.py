@@ -1,11 +1,35 @@
-from dataclasses import dataclass
-from datetime import datetime
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .session import Session
 
-@dataclass
+
+# Bound once so the hot helpers below skip the attribute lookup on each call
+_now = datetime.now
+_today = date.today
+_date_fromiso = date.fromisoformat
+
+
+def _now_iso() -> str:
+    """Current local time as an ISO timestamp"""
+    return _now().isoformat()
+
+
+def _intern(value):
+    """Intern low-cardinality string columns so repeated rows share one object"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD string, also accepting full ISO timestamps"""
+    # Only the date part is needed, so never build a datetime
+    return _date_fromiso(value if len(value) == 10 else value[:10])
+
+
+@dataclass(slots=True)
 class Task:
     """
     Task data model (Invoice-style for students)
@@ -55,14 +79,18 @@ class Task:
     updated_at: Optional[str] = None
     is_deleted: bool = False
     deleted_at: Optional[str] = None
+
+    # Parsed (source string, date) pairs for date_due / date_given / completed_at
+    _date_due_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _date_given_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _completed_date_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Initialize timestamps if not provided"""
-        now = datetime.now().isoformat()
-        if not self.created_at:
-            self.created_at = now
-        if not self.updated_at:
-            self.updated_at = now
+        if not self.created_at or not self.updated_at:
+            now = _now_iso()
+            self.created_at = self.created_at or now
+            self.updated_at = self.updated_at or now
     
     def to_dict(self) -> dict:
         """Convert task to dictionary for database storage"""
@@ -77,55 +105,72 @@ class Task:
             "description": self.description,
             "estimated_time": self.estimated_time,
             "status": self.status,
-            "is_recurring": 1 if self.is_recurring else 0,
+            "is_recurring": int(self.is_recurring),
             "recurrence_type": self.recurrence_type,
             "recurrence_interval": self.recurrence_interval,
             "recurrence_until": self.recurrence_until,
             "completed_at": self.completed_at,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
-            "is_deleted": 1 if self.is_deleted else 0,
+            "is_deleted": int(self.is_deleted),
             "deleted_at": self.deleted_at,
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'Task':
         """Create Task instance from dictionary (from database)"""
-        return cls(
-            id=data.get("id"),
-            user_id=data["user_id"],
-            title=data["title"],
-            source=data["source"],
-            category=data["category"],
-            date_given=data["date_given"],
-            date_due=data.get("date_due"),
-            description=data.get("description"),
-            estimated_time=data.get("estimated_time"),
-            status=data.get("status", "Not Started"),
-            is_recurring=bool(data.get("is_recurring", 0)),
-            recurrence_type=data.get("recurrence_type"),
-            recurrence_interval=int(data.get("recurrence_interval", 1) or 1),
-            recurrence_until=data.get("recurrence_until"),
-            completed_at=data.get("completed_at"),
-            created_at=data.get("created_at"),
-            updated_at=data.get("updated_at"),
-            is_deleted=bool(data.get("is_deleted", 0)),
-            deleted_at=data.get("deleted_at"),
-        )
+        # Assign slots directly: rows from the database already carry their
+        # timestamps, so __init__/__post_init__ would only add overhead.
+        task = cls.__new__(cls)
+        task.id = data.get("id")
+        task.user_id = data["user_id"]
+        task.title = data["title"]
+        task.source = _intern(data["source"])
+        task.category = _intern(data["category"])
+        task.date_given = data["date_given"]
+        task.date_due = data.get("date_due")
+        task.description = data.get("description")
+        task.estimated_time = data.get("estimated_time")
+        task.sessions = None
+        task.status = _intern(data.get("status", "Not Started"))
+        task.is_recurring = bool(data.get("is_recurring", 0))
+        task.recurrence_type = _intern(data.get("recurrence_type"))
+        task.recurrence_interval = int(data.get("recurrence_interval", 1) or 1)
+        task.recurrence_until = data.get("recurrence_until")
+        task.completed_at = data.get("completed_at")
+        task.created_at = data.get("created_at")
+        task.updated_at = data.get("updated_at")
+        task.is_deleted = bool(data.get("is_deleted", 0))
+        task.deleted_at = data.get("deleted_at")
+        task._date_due_cache = None
+        task._date_given_cache = None
+        task._completed_date_cache = None
+        if not task.created_at or not task.updated_at:
+            now = _now_iso()
+            task.created_at = task.created_at or now
+            task.updated_at = task.updated_at or now
+        return task
     
-    def mark_complete(self):
-        """Mark task as completed"""
+    def mark_complete(self, now: Optional[str] = None):
+        """
+        Mark task as completed
+
+        Args:
+            now: ISO timestamp to use, so batch callers can share one clock read
+        """
+        if now is None:
+            now = _now_iso()
         self.status = "Completed"
-        self.completed_at = datetime.now().isoformat()
-        self.updated_at = datetime.now().isoformat()
+        self.completed_at = now
+        self.updated_at = now
 
     def compute_actual_minutes(self, sessions: list["Session"]) -> float:
         """Pass in session objects, get total minutes back."""
-        return sum(
+        return sum([
             session.duration_minutes
             for session in sessions
             if not session.is_deleted and session.duration_minutes is not None
-        )
+        ])
 
     @property
     def actual_time(self) -> Optional[float]:
@@ -134,15 +179,43 @@ class Task:
             return None
         return self.compute_actual_minutes(self.sessions)
     
-    def is_overdue(self) -> bool:
-        """Check if task is overdue"""
+    def _due_date(self) -> date:
+        """date_due as a date, parsed once per distinct value"""
+        cached = self._date_due_cache
+        if cached is None or cached[0] != self.date_due:
+            cached = (self.date_due, _parse_date(self.date_due))
+            self._date_due_cache = cached
+        return cached[1]
+
+    def _given_date(self) -> date:
+        """date_given as a date, parsed once per distinct value"""
+        cached = self._date_given_cache
+        if cached is None or cached[0] != self.date_given:
+            cached = (self.date_given, _parse_date(self.date_given))
+            self._date_given_cache = cached
+        return cached[1]
+
+    def _completed_date(self) -> date:
+        """Date part of completed_at, parsed once per distinct value"""
+        cached = self._completed_date_cache
+        if cached is None or cached[0] != self.completed_at:
+            cached = (self.completed_at, _parse_date(self.completed_at))
+            self._completed_date_cache = cached
+        return cached[1]
+    
+    def is_overdue(self, today: Optional[date] = None) -> bool:
+        """
+        Check if task is overdue
+
+        Args:
+            today: Reference date, so bulk callers read the clock once
+        """
         if not self.date_due or self.status == "Completed":
             return False
         
         try:
-            due = datetime.fromisoformat(self.date_due)
-            return datetime.now().date() > due.date()
-        except:
+            return (today or _today()) > self._due_date()
+        except (ValueError, TypeError):
             return False
     
     def days_to_complete(self) -> Optional[int]:
@@ -154,27 +227,31 @@ class Task:
             return None
         
         try:
-            given = datetime.fromisoformat(self.date_given).date()
-            completed = datetime.fromisoformat(self.completed_at).date()
-            return (completed - given).days
-        except:
+            return (self._completed_date() - self._given_date()).days
+        except (ValueError, TypeError):
             return None
     
-    def days_until_due(self) -> Optional[int]:
-        """Calculate days until due date"""
+    def days_until_due(self, today: Optional[date] = None) -> Optional[int]:
+        """
+        Calculate days until due date
+
+        Args:
+            today: Reference date, so bulk callers read the clock once
+        """
         if not self.date_due:
             return None
         
         try:
-            due = datetime.fromisoformat(self.date_due).date()
-            today = datetime.now().date()
-            return (due - today).days
-        except:
+            return (self._due_date() - (today or _today())).days
+        except (ValueError, TypeError):
             return None
     
     def is_group_task(self) -> bool:
         """Check if task is a group task"""
-        return "group" in self.category.lower()
+        is_group = _GROUP_BY_CATEGORY.get(self.category)
+        if is_group is None:
+            is_group = "group" in self.category.lower()
+        return is_group
     
     def time_accuracy(self) -> Optional[float]:
         """
@@ -192,6 +269,10 @@ class Task:
         Get implicit priority based on category
         quiz < learning task < project (for analytics)
         """
+        priority = _PRIORITY_BY_CATEGORY.get(self.category)
+        if priority is not None:
+            return priority
+
         category_lower = self.category.lower()
         if "quiz" in category_lower:
             return "Low"
@@ -218,4 +299,17 @@ CATEGORIES = [
     "others"
 ]
 
-STATUSES = ["Not Started", "In Progress", "Completed"]
\ No newline at end of file
+STATUSES = ["Not Started", "In Progress", "Completed"]
+
+# Precomputed answers for the fixed categories; other values fall back to
+# substring matching in is_group_task / get_implicit_priority.
+_GROUP_BY_CATEGORY = {category: "group" in category for category in CATEGORIES}
+_PRIORITY_BY_CATEGORY = {
+    "quiz": "Low",
+    "learning task (individual)": "Medium",
+    "learning task (group)": "Medium",
+    "project (individual)": "High",
+    "project (group)": "High",
+    "study/review": "Medium",
+    "others": "Medium",
+}
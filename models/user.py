@@ -1,9 +1,10 @@
 from dataclasses import dataclass, field
 from datetime import datetime, time, timedelta
 from typing import Optional
+import os
 import bcrypt
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """
     User data model with authentication and time budget info
@@ -36,6 +37,9 @@ class User:
         last_login: Last successful login
     """
     
+    # bcrypt cost for new hashes; existing hashes keep the cost they were made with
+    BCRYPT_ROUNDS = int(os.getenv("TYMATE_BCRYPT_ROUNDS", "12"))
+    
     # Required fields
     username: str
     password_hash: str
@@ -68,11 +72,11 @@ class User:
     
     def __post_init__(self):
         """Initialize timestamps if not provided"""
-        now = datetime.now().isoformat()
-        if not self.created_at:
-            self.created_at = now
-        if not self.updated_at:
-            self.updated_at = now
+        # Rows loaded from the database carry both, so skip the clock read
+        if not self.created_at or not self.updated_at:
+            now = datetime.now().isoformat()
+            self.created_at = self.created_at or now
+            self.updated_at = self.updated_at or now
     
     @staticmethod
     def hash_password(password: str) -> str:
@@ -85,7 +89,7 @@ class User:
         Returns:
             Hashed password string (bcrypt format)
         """
-        salt = bcrypt.gensalt(rounds=12)
+        salt = bcrypt.gensalt(rounds=User.BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
@@ -3,25 +3,54 @@ Emerging Tech Feature: Predictive Analytics & Smart Recommendations
 FIXED VERSION with proper error handling and date parsing
 """
 
-from datetime import datetime, timedelta
+from datetime import date as date_type, datetime, timedelta
 from typing import List, Dict, Optional
 from storage.sqlite import get_database
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+import calendar
+import copy
 import statistics
+import time
+
+# Mon, Tue, etc (shortened), indexed by date.weekday(). Built once: day_abbr
+# itself calls strftime on every lookup.
+_DAY_LABELS = tuple(name[:3] for name in calendar.day_abbr)
 
 
 class AnalyticsEngine:
     """
     Advanced analytics engine for task and time management insights
     """
+
+    DETAILED_CACHE_TTL_SECONDS = 60
+    DETAILED_CACHE_SIZE = 64
+
+    # Shared across instances: views create a new engine on every page build.
+    # Maps (db_path, user_id, today, db change count) -> (created_at, result).
+    _detailed_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
     
     def __init__(self):
         self.db = get_database()
+
+    def _data_version(self) -> Optional[int]:
+        """Rows changed on the shared connection so far; any write bumps it"""
+        connection = getattr(self.db, "connection", None)
+        return getattr(connection, "total_changes", None)
     
-    def _parse_date(self, date_str: str) -> Optional[datetime]:
-        """Safely parse date string with multiple format attempts"""
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _parse_date(date_str: str) -> Optional[datetime]:
+        """
+        Safely parse date string with multiple format attempts.
+        Memoized: task rows repeat the same dates across metrics.
+        """
         if not date_str:
             return None
+
+        parsed = AnalyticsEngine._parse_iso_fast(date_str)
+        if parsed is not None:
+            return parsed
         
         formats = [
             "%Y-%m-%d %H:%M:%S.%f",
@@ -49,6 +78,46 @@ class AnalyticsEngine:
         except:
             return None
     
+    @staticmethod
+    def _parse_iso_fast(date_str: str) -> Optional[datetime]:
+        """
+        Parse the formats SQLite and isoformat() write by slicing fixed positions:
+        YYYY-MM-DD, optionally followed by ' HH:MM:SS' or 'THH:MM:SS' and '.ffffff'.
+        Returns None for anything else so the caller can fall back to strptime.
+        """
+        if not isinstance(date_str, str):
+            return None
+        length = len(date_str)
+        if length < 10 or date_str[4] != "-" or date_str[7] != "-":
+            return None
+        date_digits = date_str[0:4] + date_str[5:7] + date_str[8:10]
+        if not date_digits.isdigit():
+            return None
+        try:
+            if length == 10:
+                return datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+
+            if length < 19 or date_str[10] not in " T" or date_str[13] != ":" or date_str[16] != ":":
+                return None
+            time_digits = date_str[11:13] + date_str[14:16] + date_str[17:19]
+            if not time_digits.isdigit():
+                return None
+
+            microsecond = 0
+            if length > 19:
+                fraction = date_str[20:]
+                if date_str[19] != "." or not 1 <= len(fraction) <= 6 or not fraction.isdigit():
+                    return None
+                microsecond = int(fraction.ljust(6, "0"))
+
+            return datetime(
+                int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+                microsecond,
+            )
+        except ValueError:
+            return None
+    
     # ==================== Core Analytics ====================
     
     def get_task_completion_metrics(self, user_id: int, days: int = 30) -> Dict:
@@ -58,8 +127,9 @@ class AnalyticsEngine:
         try:
             cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
             
-            # Get completed tasks
-            completed = self.db.fetch_all("""
+            # One scan over the window: every task counts toward its category
+            # total, completed ones also feed the per-task metrics.
+            window_tasks = self.db.fetch_all("""
                 SELECT 
                     t.id,
                     t.date_given,
@@ -68,17 +138,26 @@ class AnalyticsEngine:
                     t.category,
                     t.estimated_time,
                     SUM(ts.duration_minutes) as actual_minutes,
-                    t.status
+                    t.status,
+                    CAST(julianday(date(t.completed_at)) - julianday(date(t.date_given)) AS INTEGER) as days_taken,
+                    CASE
+                        WHEN date(t.date_due) IS NULL THEN NULL
+                        WHEN date(t.completed_at) <= date(t.date_due) THEN 1
+                        ELSE 0
+                    END as on_time
                 FROM tasks t
                 LEFT JOIN task_sessions ts
                     ON ts.task_id = t.id AND ts.is_deleted = 0
                 WHERE t.user_id = ? 
-                AND t.status = 'Completed'
-                AND t.completed_at IS NOT NULL
                 AND t.date_given >= ?
                 AND t.is_deleted = 0
                 GROUP BY t.id
             """, (user_id, cutoff_date))
+
+            completed = [
+                task for task in window_tasks
+                if task["status"] == "Completed" and task["completed_at"] is not None
+            ]
             
             if not completed:
                 return self._empty_metrics()
@@ -87,12 +166,15 @@ class AnalyticsEngine:
             completion_times = []
             on_time_count = 0
             late_count = 0
-            category_stats = defaultdict(lambda: {"completed": 0, "total": 0})
+            category_stats = {}
             time_accuracy = []
             
             for task in completed:
-                try:
-                    # Parse dates safely
+                # Date math is done in SQL; only values SQLite cannot read
+                # (e.g. MM-DD-YYYY user input) are parsed here.
+                days_taken = task["days_taken"]
+                on_time = task["on_time"]
+                if days_taken is None or (task["date_due"] and on_time is None):
                     date_given = self._parse_date(task["date_given"])
                     completed_at = self._parse_date(task["completed_at"])
                     date_due = self._parse_date(task["date_due"])
@@ -100,50 +182,52 @@ class AnalyticsEngine:
                     if not all([date_given, completed_at]):
                         continue
 
-                    # Days from given to completion
                     days_taken = (completed_at.date() - date_given.date()).days
-                    if days_taken >= 0:  # Only positive values
-                        completion_times.append(days_taken)
-
-                    # On-time vs late requires a valid due date
-                    if date_due:
-                        if completed_at.date() <= date_due.date():
-                            on_time_count += 1
-                        else:
-                            late_count += 1
-                    
-                    # Category stats
-                    category = task["category"] or "Uncategorized"
-                    category_stats[category]["completed"] += 1
-                    
-                    # Time estimation accuracy
-                    if task["estimated_time"] and task["actual_minutes"]:
+                    on_time = int(completed_at.date() <= date_due.date()) if date_due else None
+
+                # Days from given to completion
+                if days_taken >= 0:  # Only positive values
+                    completion_times.append(days_taken)
+
+                # On-time vs late requires a valid due date
+                if on_time is not None:
+                    if on_time:
+                        on_time_count += 1
+                    else:
+                        late_count += 1
+                
+                # Category stats
+                category = task["category"] or "Uncategorized"
+                stats = category_stats.get(category)
+                if stats is None:
+                    stats = category_stats[category] = {"completed": 0, "total": 0}
+                stats["completed"] += 1
+                
+                # Time estimation accuracy
+                if task["estimated_time"] and task["actual_minutes"]:
+                    try:
                         est = int(task["estimated_time"])
                         act = int(task["actual_minutes"])
-                        if est > 0:
-                            accuracy = (act / est) * 100
-                            if 10 <= accuracy <= 500:  # Reasonable bounds
-                                time_accuracy.append(accuracy)
-                
-                except Exception as e:
-                    print(f"Error processing task: {e}")
-                    continue
+                    except (TypeError, ValueError) as e:
+                        print(f"Error processing task: {e}")
+                        continue
+                    if est > 0:
+                        accuracy = (act / est) * 100
+                        if 10 <= accuracy <= 500:  # Reasonable bounds
+                            time_accuracy.append(accuracy)
             
-            # Get total tasks by category for completion rate
-            all_tasks = self.db.fetch_all("""
-                SELECT category, COUNT(*) as count
-                FROM tasks
-                WHERE user_id = ? AND date_given >= ? AND is_deleted = 0
-                GROUP BY category
-            """, (user_id, cutoff_date))
+            # Total tasks by category for completion rate
+            category_totals = defaultdict(int)
+            for task in window_tasks:
+                category_totals[task["category"]] += 1
             
-            for task in all_tasks:
-                category = task["category"] or "Uncategorized"
-                category_stats[category]["total"] = task["count"]
+            for category, count in category_totals.items():
+                category_stats.setdefault(category or "Uncategorized", {"completed": 0, "total": 0})["total"] = count
             
             # Calculate averages with fallbacks
             total_counted = on_time_count + late_count
             
+            # mean, not fmean: a whole-day average stays an int and shows as "10d"
             avg_completion_days = statistics.mean(completion_times) if completion_times else None
             median_completion_days = statistics.median(completion_times) if completion_times else None
             
@@ -153,12 +237,18 @@ class AnalyticsEngine:
             
             # Time estimation accuracy
             if time_accuracy:
-                avg_time_accuracy = statistics.mean(time_accuracy)
+                avg_time_accuracy = statistics.fmean(time_accuracy)
                 time_accuracy_status = self._get_accuracy_status(avg_time_accuracy)
             else:
                 avg_time_accuracy = 0
                 time_accuracy_status = "No data"
             
+            _round = round
+            category_completion_rates = {}
+            for cat, stats in category_stats.items():
+                total = stats["total"]
+                category_completion_rates[cat] = _round(stats["completed"] / total * 100, 1) if total > 0 else 0
+            
             return {
                 "avg_completion_days": round(avg_completion_days, 1) if avg_completion_days is not None else None,
                 "median_completion_days": round(median_completion_days, 1) if median_completion_days is not None else None,
@@ -166,10 +256,7 @@ class AnalyticsEngine:
                 "late_percentage": round((late_count / total_counted) * 100, 1) if total_counted > 0 else 0,
                 "task_velocity": round(task_velocity, 1),
                 "total_completed": len(completed),
-                "category_completion_rates": {
-                    cat: round((stats["completed"] / stats["total"]) * 100, 1) if stats["total"] > 0 else 0
-                    for cat, stats in category_stats.items()
-                },
+                "category_completion_rates": category_completion_rates,
                 "time_estimation_accuracy": round(avg_time_accuracy, 1),
                 "time_accuracy_status": time_accuracy_status,
             }
@@ -209,45 +296,41 @@ class AnalyticsEngine:
             last_minute_completions = 0
             overdue_tasks = 0
             total_analyzed = 0
+            today = datetime.now().date()
             
             for task in tasks:
-                try:
-                    date_given = self._parse_date(task["date_given"])
-                    date_due = self._parse_date(task["date_due"])
-                    
-                    if not all([date_given, date_due]):
+                date_given = self._parse_date(task["date_given"])
+                date_due = self._parse_date(task["date_due"])
+                
+                if not all([date_given, date_due]):
+                    continue
+                
+                total_days = (date_due - date_given).days
+                
+                if task["completed_at"]:
+                    completed_at = self._parse_date(task["completed_at"])
+                    if not completed_at:
                         continue
                     
-                    total_days = (date_due - date_given).days
+                    days_before_due = (date_due - completed_at).days
+
+                    # Last minute: only meaningful for tasks with ≥3-day window.
+                    # 1- or 2-day tasks are inherently short and should never be
+                    # penalised for being completed close to the deadline.
+                    if total_days >= 3 and (days_before_due <= total_days * 0.2):
+                        last_minute_completions += 1
                     
-                    if task["completed_at"]:
-                        completed_at = self._parse_date(task["completed_at"])
-                        if not completed_at:
-                            continue
-                        
-                        days_before_due = (date_due - completed_at).days
-
-                        # Last minute: only meaningful for tasks with ≥3-day window.
-                        # 1- or 2-day tasks are inherently short and should never be
-                        # penalised for being completed close to the deadline.
-                        if total_days >= 3 and (days_before_due <= total_days * 0.2):
-                            last_minute_completions += 1
-                        
-                        # Late completion
-                        if completed_at.date() > date_due.date():
-                            overdue_tasks += 1
-                        
-                        total_analyzed += 1
+                    # Late completion
+                    if completed_at.date() > date_due.date():
+                        overdue_tasks += 1
                     
-                    elif task["status"] != "Completed":
-                        # Check if currently overdue
-                        if datetime.now().date() > date_due.date():
-                            overdue_tasks += 1
-                            total_analyzed += 1
+                    total_analyzed += 1
                 
-                except Exception as e:
-                    print(f"Error processing task for procrastination: {e}")
-                    continue
+                elif task["status"] != "Completed":
+                    # Check if currently overdue
+                    if today > date_due.date():
+                        overdue_tasks += 1
+                        total_analyzed += 1
             
             if total_analyzed == 0:
                 return {
@@ -317,43 +400,41 @@ class AnalyticsEngine:
         try:
             cutoff_date = (datetime.now() - timedelta(weeks=weeks)).strftime("%Y-%m-%d")
             
-            # Get completed tasks grouped by week
-            completed = self.db.fetch_all("""
-                SELECT 
-                    date(t.completed_at) as completion_date,
-                    SUM(ts.duration_minutes) as actual_minutes
-                FROM tasks t
-                LEFT JOIN task_sessions ts
-                    ON ts.task_id = t.id AND ts.is_deleted = 0
-                WHERE t.user_id = ?
-                AND t.status = 'Completed'
-                AND t.completed_at IS NOT NULL
-                AND t.completed_at >= ?
-                AND t.is_deleted = 0
-                GROUP BY t.id
-                ORDER BY t.completed_at
+            # Per-day totals in SQL (at most one row per day in the window);
+            # minutes are truncated per task, as the weekly view always did.
+            daily = self.db.fetch_all("""
+                SELECT
+                    completion_date,
+                    COUNT(*) as tasks,
+                    SUM(CAST(actual_minutes AS INTEGER)) as minutes
+                FROM (
+                    SELECT 
+                        date(t.completed_at) as completion_date,
+                        SUM(ts.duration_minutes) as actual_minutes
+                    FROM tasks t
+                    LEFT JOIN task_sessions ts
+                        ON ts.task_id = t.id AND ts.is_deleted = 0
+                    WHERE t.user_id = ?
+                    AND t.status = 'Completed'
+                    AND t.completed_at IS NOT NULL
+                    AND t.completed_at >= ?
+                    AND t.is_deleted = 0
+                    GROUP BY t.id
+                )
+                WHERE completion_date IS NOT NULL
+                GROUP BY completion_date
+                ORDER BY completion_date
             """, (user_id, cutoff_date))
             
-            # Group by week manually
+            # Roll days up into ISO weeks (SQLite's %W is not ISO-8601)
             weekly_stats = defaultdict(lambda: {"tasks": 0, "minutes": 0})
             
-            for task in completed:
-                try:
-                    comp_date = self._parse_date(task["completion_date"])
-                    if not comp_date:
-                        continue
-                    
-                    # Get ISO week
-                    year, week, _ = comp_date.isocalendar()
-                    week_key = f"{year}-W{week:02d}"
-                    
-                    weekly_stats[week_key]["tasks"] += 1
-                    if task["actual_minutes"]:
-                        weekly_stats[week_key]["minutes"] += int(task["actual_minutes"])
+            for day in daily:
+                year, week, _ = date_type.fromisoformat(day["completion_date"]).isocalendar()
+                week_key = f"{year}-W{week:02d}"
                 
-                except Exception as e:
-                    print(f"Error processing weekly task: {e}")
-                    continue
+                weekly_stats[week_key]["tasks"] += day["tasks"]
+                weekly_stats[week_key]["minutes"] += day["minutes"] or 0
             
             # Convert to list
             weekly_data = [
@@ -377,8 +458,8 @@ class AnalyticsEngine:
                 older_segment = weekly_task_counts[:split]
                 recent_segment = weekly_task_counts[-split:]
 
-                older_avg = statistics.mean(older_segment)
-                recent_avg = statistics.mean(recent_segment)
+                older_avg = statistics.fmean(older_segment)
+                recent_avg = statistics.fmean(recent_segment)
 
                 if older_avg == 0 and recent_avg == 0:
                     trend = "insufficient_data"
@@ -392,7 +473,7 @@ class AnalyticsEngine:
             # Predict next week from available recent weeks.
             prediction_window = min(3, len(weekly_data))
             if prediction_window > 0:
-                predicted_tasks = statistics.mean(weekly_task_counts[-prediction_window:])
+                predicted_tasks = statistics.fmean(weekly_task_counts[-prediction_window:])
             else:
                 predicted_tasks = 0
 
@@ -450,34 +531,29 @@ class AnalyticsEngine:
             
             insights = []
             for row in data:
-                try:
-                    total = row["total_tasks"] or 0
-                    completed = row["completed"] or 0
-                    late = row["late_count"] or 0
-                    
-                    completion_rate = (completed / total * 100) if total > 0 else 0
-                    on_time_rate = ((completed - late) / completed * 100) if completed > 0 else 0
-                    
-                    # Time accuracy
-                    time_accuracy = None
-                    if row["avg_estimated_minutes"] and row["avg_actual_minutes"]:
-                        est = float(row["avg_estimated_minutes"])
-                        act = float(row["avg_actual_minutes"])
-                        if est > 0:
-                            time_accuracy = (act / est) * 100
-                    
-                    insights.append({
-                        "category": row["category"] or "Uncategorized",
-                        "total_tasks": total,
-                        "completion_rate": round(completion_rate, 1),
-                        "on_time_rate": round(on_time_rate, 1),
-                        "avg_minutes": float(row["avg_actual_minutes"] or 0),
-                        "time_accuracy": round(time_accuracy, 1) if time_accuracy else None,
-                    })
+                total = row["total_tasks"] or 0
+                completed = row["completed"] or 0
+                late = row["late_count"] or 0
                 
-                except Exception as e:
-                    print(f"Error processing category insight: {e}")
-                    continue
+                completion_rate = (completed / total * 100) if total > 0 else 0
+                on_time_rate = ((completed - late) / completed * 100) if completed > 0 else 0
+                
+                # Time accuracy
+                time_accuracy = None
+                if row["avg_estimated_minutes"] and row["avg_actual_minutes"]:
+                    est = float(row["avg_estimated_minutes"])
+                    act = float(row["avg_actual_minutes"])
+                    if est > 0:
+                        time_accuracy = (act / est) * 100
+                
+                insights.append({
+                    "category": row["category"] or "Uncategorized",
+                    "total_tasks": total,
+                    "completion_rate": round(completion_rate, 1),
+                    "on_time_rate": round(on_time_rate, 1),
+                    "avg_minutes": float(row["avg_actual_minutes"] or 0),
+                    "time_accuracy": round(time_accuracy, 1) if time_accuracy else None,
+                })
             
             return insights
         
@@ -491,29 +567,35 @@ class AnalyticsEngine:
         timestamps and duration_minutes — the same data the Time It page writes.
         """
         try:
-            sessions = self.db.fetch_all("""
+            # Aggregate per hour in SQL. Timestamps SQLite cannot read come
+            # back raw (hour is NULL) and are parsed in Python instead.
+            hour_rows = self.db.fetch_all("""
                 SELECT
-                    logged_at,
-                    duration_minutes
+                    CAST(strftime('%H', logged_at) AS INTEGER) as hour,
+                    CASE WHEN strftime('%H', logged_at) IS NULL THEN logged_at END as raw_logged_at,
+                    SUM(duration_minutes) as minutes,
+                    COUNT(*) as count,
+                    MIN(id) as first_id
                 FROM task_sessions
                 WHERE user_id = ?
                 AND logged_at IS NOT NULL
                 AND duration_minutes > 0
                 AND is_deleted = 0
+                GROUP BY hour, raw_logged_at
+                ORDER BY first_id
             """, (user_id,))
 
             hour_productivity = defaultdict(lambda: {"minutes": 0, "count": 0})
 
-            for session in sessions:
-                if session["logged_at"]:
-                    try:
-                        logged_dt = self._parse_date(session["logged_at"])
-                        if logged_dt:
-                            hour = logged_dt.hour
-                            hour_productivity[hour]["minutes"] += float(session["duration_minutes"])
-                            hour_productivity[hour]["count"] += 1
-                    except:
+            for row in hour_rows:
+                hour = row["hour"]
+                if hour is None:
+                    logged_dt = self._parse_date(row["raw_logged_at"])
+                    if not logged_dt:
                         continue
+                    hour = logged_dt.hour
+                hour_productivity[hour]["minutes"] += float(row["minutes"])
+                hour_productivity[hour]["count"] += row["count"]
 
             # Rank by total minutes logged per hour
             peak_hours = sorted(
@@ -537,13 +619,22 @@ class AnalyticsEngine:
         """
         Generate personalized smart tips based on analytics
         """
+        return self._generate_smart_tips(
+            self.get_task_completion_metrics(user_id),
+            self.get_procrastination_score(user_id),
+            self.get_category_insights(user_id),
+        )
+
+    def _generate_smart_tips(
+        self,
+        completion_metrics: Dict,
+        procrastination: Dict,
+        category_insights: List[Dict],
+    ) -> List[Dict]:
+        """Build smart tips from already computed analytics results"""
         tips = []
         
         try:
-            completion_metrics = self.get_task_completion_metrics(user_id)
-            procrastination = self.get_procrastination_score(user_id)
-            category_insights = self.get_category_insights(user_id)
-            
             # Tip 1: Time estimation
             accuracy = completion_metrics["time_estimation_accuracy"]
             time_accuracy_status = completion_metrics.get("time_accuracy_status")
@@ -640,44 +731,67 @@ class AnalyticsEngine:
         try:
             data = []
             today = datetime.now().date()
-            
-            for i in range(days):
-                date = today - timedelta(days=days - i - 1)
-                date_str = date.strftime("%Y-%m-%d")
-                
-                # Count completed tasks for this day.
-                # Some `completed_at` values may be in MM-DD-YYYY (user input),
-                # so match both ISO and common US formats.
-                mm_dd = date.strftime("%m-%d-%Y")
-                count = self.db.fetch_one("""
-                    SELECT COUNT(*) as count
-                    FROM tasks
-                    WHERE user_id = ?
-                    AND status = 'Completed'
-                    AND is_deleted = 0
-                    AND (
-                        DATE(completed_at) = ?
-                        OR completed_at = ?
-                        OR completed_at LIKE ?
-                    )
-                """, (user_id, date_str, mm_dd, f"%{mm_dd}%"))
-                
-                # Get task session minutes logged on this date
-                minutes = self.db.fetch_one("""
-                    SELECT SUM(ts.duration_minutes) as total
-                    FROM task_sessions ts
-                    JOIN tasks t ON t.id = ts.task_id
-                    WHERE ts.user_id = ?
-                    AND DATE(ts.logged_at) = ?
-                    AND ts.is_deleted = 0
-                    AND t.is_deleted = 0
-                """, (user_id, date_str))
+            window = [today - timedelta(days=days - i - 1) for i in range(days)]
+            start_str = window[0].isoformat()
+            end_str = today.isoformat()
+
+            # Completed tasks per day for the whole window in one query.
+            # Some `completed_at` values may be in MM-DD-YYYY (user input);
+            # SQLite's DATE() returns NULL for those, so they come back raw
+            # and are matched against each day's MM-DD-YYYY form below.
+            completed_rows = self.db.fetch_all("""
+                SELECT
+                    DATE(completed_at) as day,
+                    CASE WHEN DATE(completed_at) IS NULL THEN completed_at END as raw_completed_at,
+                    COUNT(*) as count
+                FROM tasks
+                WHERE user_id = ?
+                AND status = 'Completed'
+                AND is_deleted = 0
+                AND completed_at IS NOT NULL
+                AND (
+                    DATE(completed_at) BETWEEN ? AND ?
+                    OR DATE(completed_at) IS NULL
+                )
+                GROUP BY day, raw_completed_at
+            """, (user_id, start_str, end_str))
+
+            counts_by_day = {}
+            unparsed_completions = []
+            for row in completed_rows:
+                if row["day"] is not None:
+                    counts_by_day[row["day"]] = row["count"]
+                else:
+                    unparsed_completions.append((row["raw_completed_at"], row["count"]))
+
+            # Task session minutes logged per day for the whole window
+            minutes_rows = self.db.fetch_all("""
+                SELECT DATE(ts.logged_at) as day, SUM(ts.duration_minutes) as total
+                FROM task_sessions ts
+                JOIN tasks t ON t.id = ts.task_id
+                WHERE ts.user_id = ?
+                AND DATE(ts.logged_at) BETWEEN ? AND ?
+                AND ts.is_deleted = 0
+                AND t.is_deleted = 0
+                GROUP BY day
+            """, (user_id, start_str, end_str))
+            minutes_by_day = {row["day"]: row["total"] for row in minutes_rows}
+
+            for date in window:
+                date_str = date.isoformat()
+
+                count = counts_by_day.get(date_str, 0)
+                if unparsed_completions:
+                    mm_dd = f"{date.month:02d}-{date.day:02d}-{date.year:04d}"
+                    for raw_value, raw_count in unparsed_completions:
+                        if mm_dd in raw_value:
+                            count += raw_count
                 
                 data.append({
-                    "date": date.strftime("%a")[:3],  # Mon, Tue, etc (shortened)
+                    "date": _DAY_LABELS[date.weekday()],
                     "full_date": date_str,
-                    "tasks": count["count"] if count else 0,
-                    "minutes": float(minutes["total"] or 0) if minutes else 0,
+                    "tasks": count,
+                    "minutes": float(minutes_by_day.get(date_str) or 0),
                 })
             
             return {"daily_data": data}
@@ -689,16 +803,49 @@ class AnalyticsEngine:
     def get_detailed_analytics_data(self, user_id: int) -> Dict:
         """
         Get comprehensive analytics for full analytics page
+
+        Results are reused for up to DETAILED_CACHE_TTL_SECONDS while no row
+        in the database has changed.
         """
-        return {
-            "completion_metrics": self.get_task_completion_metrics(user_id),
-            "procrastination": self.get_procrastination_score(user_id),
-            "productivity_trends": self.get_productivity_trends(user_id),
-            "category_insights": self.get_category_insights(user_id),
-            "peak_hours": self.get_peak_productivity_hours(user_id),
-            "smart_tips": self.generate_smart_tips(user_id),
-            "chart_data": self.get_dashboard_chart_data(user_id, days=30),
-        }
+        version = self._data_version()
+        cache_key = None
+        if isinstance(version, int):
+            cache_key = (self.db.db_path, user_id, datetime.now().date(), version)
+            cached = self._detailed_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < self.DETAILED_CACHE_TTL_SECONDS:
+                return copy.deepcopy(cached[1])
+
+        result = self._compute_detailed_analytics_data(user_id)
+
+        if cache_key is not None:
+            cache = self._detailed_cache
+            cache[cache_key] = (time.monotonic(), result)
+            cache.move_to_end(cache_key)
+            while len(cache) > self.DETAILED_CACHE_SIZE:
+                cache.popitem(last=False)
+            result = copy.deepcopy(result)
+        return result
+
+    def _compute_detailed_analytics_data(self, user_id: int) -> Dict:
+        """Run every analytics query for the analytics page"""
+        try:
+            completion_metrics = self.get_task_completion_metrics(user_id)
+            procrastination = self.get_procrastination_score(user_id)
+            category_insights = self.get_category_insights(user_id)
+            return {
+                "completion_metrics": completion_metrics,
+                "procrastination": procrastination,
+                "productivity_trends": self.get_productivity_trends(user_id),
+                "category_insights": category_insights,
+                "peak_hours": self.get_peak_productivity_hours(user_id),
+                "smart_tips": self._generate_smart_tips(
+                    completion_metrics, procrastination, category_insights
+                ),
+                "chart_data": self.get_dashboard_chart_data(user_id, days=30),
+            }
+        finally:
+            # Parsed dates are only worth keeping within one page load
+            self._parse_date.cache_clear()
     
     # ==================== Helper Methods ====================
     
@@ -17,6 +17,15 @@ SYNC_SERVER_URL = os.getenv("TYMATE_SYNC_URL", "")  # e.g. https://tymate-sync.a
 _token: Optional[str] = None
 _user_id: Optional[int] = None
 
+# Updates the existing (user_id, setting_key) row in place; INSERT OR REPLACE
+# would delete and re-insert it, giving the setting a new id each time.
+_UPSERT_SETTING_SQL = """
+    INSERT INTO settings (user_id, setting_key, setting_value, updated_at) VALUES (?, ?, ?, ?)
+    ON CONFLICT(user_id, setting_key) DO UPDATE SET
+        setting_value = excluded.setting_value,
+        updated_at = excluded.updated_at
+"""
+
 
 # ==================== Auth ====================
 
@@ -388,7 +397,7 @@ def _merge_settings(db, settings: list, user_id: int):
             if not key:
                 continue
             db.execute_query(
-                "INSERT OR REPLACE INTO settings (user_id, setting_key, setting_value, updated_at) VALUES (?, ?, ?, ?)",
+                _UPSERT_SETTING_SQL,
                 (user_id, key, val, updated_at),
             )
         except Exception:
@@ -404,7 +413,7 @@ def _merge_settings(db, settings: list, user_id: int):
 def _save_sync_token(token: str, user_id: int):
     db = get_database()
     db.execute_query(
-        "INSERT OR REPLACE INTO settings (user_id, setting_key, setting_value, updated_at) VALUES (?, ?, ?, ?)",
+        _UPSERT_SETTING_SQL,
         (user_id, "sync_token", token, datetime.now().isoformat())
     )
     db.commit()
@@ -422,7 +431,7 @@ def _get_last_synced_at(user_id: int) -> Optional[str]:
 def _save_last_synced_at(user_id: int, synced_at: str):
     db = get_database()
     db.execute_query(
-        "INSERT OR REPLACE INTO settings (user_id, setting_key, setting_value, updated_at) VALUES (?, ?, ?, ?)",
+        _UPSERT_SETTING_SQL,
         (user_id, "last_synced_at", synced_at, datetime.now().isoformat())
     )
     db.commit()
@@ -1,15 +1,18 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 import secrets
 import os
 from dotenv import load_dotenv
-from storage.sqlite import get_database
+from storage.sqlite import get_database, sqlite3
 from models.user import User
 from services import sync_service
 
 # Load environment variables
 load_dotenv()
 
+_token_urlsafe = secrets.token_urlsafe
+
 class AuthManager:
     """
     Manages user authentication and sessions
@@ -27,9 +30,20 @@ class AuthManager:
     ACCOUNT_LOCK_TIMEOUT_MINUTES = 30  # Auto-unlock after 30 minutes
     SESSION_DURATION_HOURS = 24
     SESSION_TIMEOUT_MINUTES = int(os.getenv("TYMATE_SESSION_TIMEOUT_MINUTES", "30"))
+    SESSION_CACHE_SIZE = 256
+    ACTIVITY_FLUSH_SECONDS = 60  # Write sessions.last_activity at most this often
+
+    # Validated sessions shared by every AuthManager instance:
+    # token -> (user row, expires_at, last_activity, stored last_activity, data version)
+    _session_cache: OrderedDict = OrderedDict()
     
     def __init__(self):
         self.db = get_database()
+
+    def _data_version(self) -> Optional[int]:
+        """Rows changed on the shared connection so far; any write bumps it"""
+        connection = getattr(self.db, "connection", None)
+        return getattr(connection, "total_changes", None)
     
     def register_user(
         self,
@@ -120,6 +134,10 @@ class AuthManager:
             Tuple of (success: bool, message: str, user: Optional[User], token: Optional[str])
         """
         
+        # One clock read for every timestamp this login writes
+        now = datetime.now()
+        now_iso = now.isoformat()
+        
         # Get user from database
         user_data = self.db.fetch_one(
             "SELECT * FROM users WHERE username = ?",
@@ -127,7 +145,7 @@ class AuthManager:
         )
         
         if not user_data:
-            self._log_login_attempt(username, False, "User not found", ip_address)
+            self._log_login_attempt(username, False, "User not found", ip_address, now_iso)
             return False, "Invalid username or password", None, None
         
         user = User.from_dict(user_data)
@@ -135,7 +153,7 @@ class AuthManager:
         # Check if account is locked and auto-unlock if timeout expired
         if user.is_locked and user.locked_at:
             locked_time = datetime.fromisoformat(user.locked_at)
-            time_since_lock = datetime.now() - locked_time
+            time_since_lock = now - locked_time
             
             if time_since_lock >= timedelta(minutes=self.ACCOUNT_LOCK_TIMEOUT_MINUTES):
                 # Auto-unlock the account
@@ -148,7 +166,7 @@ class AuthManager:
                         "is_locked": 0,
                         "failed_login_attempts": 0,
                         "locked_at": None,
-                        "updated_at": datetime.now().isoformat()
+                        "updated_at": now_iso
                     },
                     "id = ?",
                     (user.id,)
@@ -164,59 +182,58 @@ class AuthManager:
         
         # Verify password
         if not user.verify_password(password):
-            # Increment failed attempts
-            user.failed_login_attempts += 1
+            # Increment failed attempts and lock at the limit in one statement;
+            # the count comes from the row itself, not the copy read above
+            with self.db.transaction():
+                counters = self.db.fetch_all("""
+                    UPDATE users SET
+                        failed_login_attempts = failed_login_attempts + 1,
+                        is_locked = CASE WHEN failed_login_attempts + 1 >= ? THEN 1 ELSE is_locked END,
+                        locked_at = CASE WHEN failed_login_attempts + 1 >= ? THEN ? ELSE locked_at END,
+                        updated_at = CASE WHEN failed_login_attempts + 1 >= ? THEN ? ELSE updated_at END
+                    WHERE id = ?
+                    RETURNING failed_login_attempts, is_locked
+                """, (
+                    self.MAX_FAILED_ATTEMPTS,
+                    self.MAX_FAILED_ATTEMPTS, now_iso,
+                    self.MAX_FAILED_ATTEMPTS, now_iso,
+                    user.id,
+                ))
+                user.failed_login_attempts = counters[0]["failed_login_attempts"]
+                user.is_locked = bool(counters[0]["is_locked"])
+                reason = "Account locked" if user.is_locked else "Invalid password"
+                self._log_login_attempt(username, False, reason, ip_address, now_iso)
             
-            # Lock account if too many failures
-            if user.failed_login_attempts >= self.MAX_FAILED_ATTEMPTS:
-                user.is_locked = True
-                user.locked_at = datetime.now().isoformat()
-                self.db.update(
-                    "users",
-                    {
-                        "failed_login_attempts": user.failed_login_attempts,
-                        "is_locked": 1,
-                        "locked_at": user.locked_at,
-                        "updated_at": datetime.now().isoformat()
-                    },
-                    "id = ?",
-                    (user.id,)
-                )
-                self._log_login_attempt(username, False, "Account locked", ip_address)
+            if user.is_locked:
+                user.locked_at = now_iso
                 return False, f"Too many failed attempts. Account locked for {self.ACCOUNT_LOCK_TIMEOUT_MINUTES} minutes.", None, None
-            else:
-                self.db.update(
-                    "users",
-                    {"failed_login_attempts": user.failed_login_attempts},
-                    "id = ?",
-                    (user.id,)
-                )
-                self._log_login_attempt(username, False, "Invalid password", ip_address)
-                remaining = self.MAX_FAILED_ATTEMPTS - user.failed_login_attempts
-                return False, f"Invalid password. {remaining} attempts remaining.", None, None
+            remaining = self.MAX_FAILED_ATTEMPTS - user.failed_login_attempts
+            return False, f"Invalid password. {remaining} attempts remaining.", None, None
         
         # Password correct - reset failed attempts
         user.failed_login_attempts = 0
-        user.last_login = datetime.now().isoformat()
-        
-        self.db.update(
-            "users",
-            {
-                "failed_login_attempts": 0,
-                "last_login": user.last_login,
-                "updated_at": datetime.now().isoformat()
-            },
-            "id = ?",
-            (user.id,)
-        )
-        
-        # Create session
-        session_token = self._create_session(user.id)
+        user.last_login = now_iso
         
-        # Log successful login
-        self._log_login_attempt(username, True, None, ip_address)
-        self._log_audit(user.id, "USER_LOGIN", "sessions", None, 
-                       new_value=f"User logged in successfully")
+        # Reset, session and both log rows are committed together
+        with self.db.transaction():
+            self.db.update(
+                "users",
+                {
+                    "failed_login_attempts": 0,
+                    "last_login": user.last_login,
+                    "updated_at": now_iso
+                },
+                "id = ?",
+                (user.id,)
+            )
+            
+            # Create session
+            session_token = self._create_session(user.id, now)
+            
+            # Log successful login
+            self._log_login_attempt(username, True, None, ip_address, now_iso)
+            self._log_audit(user.id, "USER_LOGIN", "sessions", None, 
+                           new_value=f"User logged in successfully", timestamp=now_iso)
 
         # Best-effort server login + pull latest data. Never block local login.
         try:
@@ -248,6 +265,7 @@ class AuthManager:
         Returns:
             True if session ended successfully
         """
+        self._session_cache.pop(session_token, None)
         try:
             self.db.update(
                 "sessions",
@@ -256,7 +274,8 @@ class AuthManager:
                 (session_token,)
             )
             return True
-        except:
+        except sqlite3.Error as e:
+            print(f"Logout failed: {e}")
             return False
     
     def get_user_by_session(self, session_token: str) -> Optional[User]:
@@ -269,70 +288,94 @@ class AuthManager:
         Returns:
             User object if session valid, None otherwise
         """
-        # Get session
-        session = self.db.fetch_one("""
-            SELECT * FROM sessions 
-            WHERE session_token = ? 
-            AND is_active = 1
-        """, (session_token,))
-        
-        if not session:
-            return None
+        # Reuse the last validation while nothing has been written since;
+        # expiry and inactivity are still checked on every call.
+        cached = self._session_cache.get(session_token)
+        if cached is not None and cached[4] is not None and cached[4] == self._data_version():
+            user_data, expires_at, last_activity, stored_activity, _ = cached
+        else:
+            # Get session and its user in one query
+            user_data = self.db.fetch_one("""
+                SELECT u.*,
+                       s.expires_at AS session_expires_at,
+                       s.last_activity AS session_last_activity
+                FROM sessions s
+                JOIN users u ON u.id = s.user_id
+                WHERE s.session_token = ? 
+                AND s.is_active = 1
+            """, (session_token,))
+            
+            if not user_data:
+                self._session_cache.pop(session_token, None)
+                return None
+            
+            expires_at = datetime.fromisoformat(user_data.pop("session_expires_at"))
+            stored_activity = datetime.fromisoformat(user_data.pop("session_last_activity"))
+            # The stored value can trail activity not yet written back
+            last_activity = max(stored_activity, cached[2]) if cached is not None else stored_activity
+        
+        now = datetime.now()
         
         # Check if session expired
-        expires_at = datetime.fromisoformat(session["expires_at"])
-        if datetime.now() > expires_at:
+        if now > expires_at:
             # Expire session
             self.logout(session_token)
             return None
         
         # Check for inactivity timeout
-        last_activity = datetime.fromisoformat(session["last_activity"])
-        timeout_threshold = datetime.now() - timedelta(minutes=self.SESSION_TIMEOUT_MINUTES)
+        timeout_threshold = now - timedelta(minutes=self.SESSION_TIMEOUT_MINUTES)
         if last_activity < timeout_threshold:
             # Session inactive too long - log out user
             self.logout(session_token)
             return None
         
-        # Get user
-        user_data = self.db.get_by_id("users", session["user_id"])
-        if not user_data:
-            return None
+        # Update last activity (debounced; the cache tracks it in between)
+        if (now - stored_activity).total_seconds() >= self.ACTIVITY_FLUSH_SECONDS:
+            self.db.update(
+                "sessions",
+                {"last_activity": now.isoformat()},
+                "session_token = ?",
+                (session_token,)
+            )
+            stored_activity = now
         
-        # Update last activity
-        self.db.update(
-            "sessions",
-            {"last_activity": datetime.now().isoformat()},
-            "session_token = ?",
-            (session_token,)
+        self._session_cache[session_token] = (
+            user_data, expires_at, now, stored_activity, self._data_version()
         )
+        self._session_cache.move_to_end(session_token)
+        if len(self._session_cache) > self.SESSION_CACHE_SIZE:
+            self._session_cache.popitem(last=False)
         
         return User.from_dict(user_data)
     
-    def _create_session(self, user_id: int) -> str:
+    def _create_session(self, user_id: int, now: Optional[datetime] = None) -> str:
         """
         Create new session for user
         
         Args:
             user_id: User ID
+            now: Creation time (defaults to the current time)
             
         Returns:
             Session token
         """
         # Generate secure random token
-        token = secrets.token_urlsafe(32)
+        token = _token_urlsafe(32)
         
         # Calculate expiry
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
+        now_iso = now.isoformat()
         expires_at = now + timedelta(hours=self.SESSION_DURATION_HOURS)
         
-        # Save session
+        # Save session (column order is fixed, so the statement text is
+        # identical every time and stays in the connection's cache)
         self.db.insert("sessions", {
             "user_id": user_id,
             "session_token": token,
-            "created_at": now.isoformat(),
+            "created_at": now_iso,
             "expires_at": expires_at.isoformat(),
-            "last_activity": now.isoformat(),
+            "last_activity": now_iso,
             "is_active": 1
         })
         
@@ -343,7 +386,8 @@ class AuthManager:
         username: str,
         success: bool,
         failure_reason: Optional[str],
-        ip_address: Optional[str]
+        ip_address: Optional[str],
+        timestamp: Optional[str] = None
     ):
         """Log login attempt to database"""
         self.db.insert("login_attempts", {
@@ -351,7 +395,7 @@ class AuthManager:
             "success": 1 if success else 0,
             "failure_reason": failure_reason,
             "ip_address": ip_address,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp or datetime.now().isoformat()
         })
     
     def _log_audit(
@@ -361,7 +405,8 @@ class AuthManager:
         table_name: str,
         record_id: Optional[int],
         old_value: Optional[str] = None,
-        new_value: Optional[str] = None
+        new_value: Optional[str] = None,
+        timestamp: Optional[str] = None
     ):
         """Log action to audit log"""
         self.db.insert("audit_logs", {
@@ -371,7 +416,7 @@ class AuthManager:
             "record_id": record_id,
             "old_value": old_value,
             "new_value": new_value,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp or datetime.now().isoformat()
         })
     
     def update_user_profile(
@@ -419,14 +464,16 @@ class AuthManager:
             updates["username"] = new_username
         
         # Add updated_at timestamp
-        updates["updated_at"] = datetime.now().isoformat()
+        updated_at = datetime.now().isoformat()
+        updates["updated_at"] = updated_at
         
         try:
             self.db.update("users", updates, "id = ?", (user_id,))
             
             self._log_audit(
                 user_id, "PROFILE_UPDATE", "users", user_id,
-                new_value=f"Updated fields: {', '.join(updates.keys())}"
+                new_value=f"Updated fields: {', '.join(updates.keys())}",
+                timestamp=updated_at
             )
 
             # Sync updated profile to server (best-effort)
@@ -475,25 +522,27 @@ class AuthManager:
         if not is_valid:
             return False, msg
         
-        # Check if new password matches old password
-        if user.verify_password(new_password):
+        # Check if new password matches old password (old_password was just
+        # verified, so a plain comparison saves a second bcrypt check)
+        if new_password == old_password:
             return False, "New password cannot be the same as old password"
         
         # Update password
         new_hash = User.hash_password(new_password)
+        updated_at = datetime.now().isoformat()
         
         self.db.update(
             "users",
             {
                 "password_hash": new_hash,
-                "updated_at": datetime.now().isoformat()
+                "updated_at": updated_at
             },
             "id = ?",
             (user_id,)
         )
         
         self._log_audit(user_id, "PASSWORD_CHANGED", "users", user_id,
-                       new_value="Password updated")
+                       new_value="Password updated", timestamp=updated_at)
 
         # Best-effort server password change so the new password works cross-device.
         try:
@@ -5,11 +5,47 @@ Concept: Budget your time like you budget money
 UPDATED: Now accounts for wake time, bedtime, and real-time calculations
 """
 
-from datetime import datetime, time, timedelta
+import time as _time
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
 from typing import Dict, Optional
 from storage.sqlite import get_database
 from services import sync_service
 
+_REFERENCE_DATE = date(2000, 1, 1)
+
+_US_PER_SECOND = 1_000_000
+_US_PER_DAY = 86_400 * _US_PER_SECOND
+_ONE_US = timedelta(microseconds=1)
+
+
+def _time_of_day_us(t) -> int:
+    """Microseconds since midnight for a time or naive datetime"""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * _US_PER_SECOND + t.microsecond
+
+
+def _hours(us: int) -> float:
+    """Microseconds to hours, rounding exactly like timedelta.total_seconds() / 3600"""
+    return us / _US_PER_SECOND / 3600
+
+
+@lru_cache(maxsize=256)
+def _waking_us(sleep_hours: float) -> int:
+    """Length of the waking day in microseconds, as timedelta would round it"""
+    return timedelta(hours=24 - sleep_hours) // _ONE_US
+
+# Time-of-day status while awake and before bedtime, bucketed by hours left:
+# under 2h, under 4h, otherwise
+_BEDTIME_THRESHOLDS = (2, 4)
+_BEDTIME_STATUS_COLORS = ("orange", "yellow", "green")
+_BEDTIME_STATUS_TEMPLATES = (
+    "Only {:.1f} hours until bedtime!",
+    "{:.1f} hours remaining today",
+    "{:.1f} hours remaining today",
+)
+
 class OnboardingManager:
     """
     Manages the onboarding process to calculate user's time budget
@@ -22,16 +58,35 @@ class OnboardingManager:
     - NOW: Accounts for wake time and bedtime for realistic calculations
     """
     
+    # (db_path, user_id) pairs known to have finished onboarding; completion
+    # is never undone, so entries need no expiry
+    _completed_users: set = set()
+    
+    # Built budgets shared by every instance:
+    # (db_path, user_id) -> (monotonic timestamp, db change count, budget dict, wake time).
+    # The profile is written by save_user_profile and by sync merges, so an
+    # entry is only reused while no row in the database has changed.
+    BUDGET_CACHE_TTL_SECONDS = 30
+    BUDGET_CACHE_SIZE = 128
+    _budget_cache: OrderedDict = OrderedDict()
+    
     def __init__(self):
         self.db = get_database()
+
+    def _data_version(self) -> Optional[int]:
+        """Rows changed on the shared connection so far; any write bumps it"""
+        connection = getattr(self.db, "connection", None)
+        return getattr(connection, "total_changes", None)
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def parse_wake_time(wake_time_str: str) -> time:
         """Parse wake time string (HH:MM) to time object"""
         hour, minute = map(int, wake_time_str.split(':'))
         return time(hour, minute)
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def calculate_bedtime(wake_time: time, sleep_hours: float) -> time:
         """
         Calculate bedtime based on wake time and sleep hours
@@ -40,13 +95,11 @@ class OnboardingManager:
         - Wake at 8:00 AM, sleep 8 hours → bedtime is 12:00 AM (midnight)
         - Wake at 7:00 AM, sleep 7 hours → bedtime is 12:00 AM (midnight)
         """
-        today = datetime.now().date()
-        wake_datetime = datetime.combine(today, wake_time)
+        # Only the time of day is returned, so any fixed date works and the
+        # result can be memoized on (wake_time, sleep_hours).
+        wake_datetime = datetime.combine(_REFERENCE_DATE, wake_time)
         bedtime_datetime = wake_datetime - timedelta(hours=sleep_hours)
         
-        if bedtime_datetime.date() < today:
-            bedtime_datetime = bedtime_datetime + timedelta(days=1)
-        
         return bedtime_datetime.time()
     
     @staticmethod
@@ -63,34 +116,16 @@ class OnboardingManager:
         Returns:
             Hours until next bedtime (positive value)
         """
-        waking_hours = 24 - sleep_hours
-        today = current_time.date()
-        wake_today = datetime.combine(today, wake_time)
-
-        # Use the latest wake time not in the future as cycle anchor.
-        if current_time >= wake_today:
-            wake_anchor = wake_today
-        else:
-            wake_anchor = wake_today - timedelta(days=1)
-
-        bedtime_dt = wake_anchor + timedelta(hours=waking_hours)
-        return (bedtime_dt - current_time).total_seconds() / 3600
+        # Time since the latest wake time not in the future (the cycle anchor);
+        # the modulo wraps back to yesterday's wake before today's.
+        since_wake_us = (_time_of_day_us(current_time) - _time_of_day_us(wake_time)) % _US_PER_DAY
+        return _hours(_waking_us(sleep_hours) - since_wake_us)
     
     @staticmethod
     def get_hours_since_wake(current_time: datetime, wake_time: time) -> float:
         """Calculate how many hours have passed since wake time"""
-        today = current_time.date()
-        wake_dt = datetime.combine(today, wake_time)
-        
-        if current_time < wake_dt:
-            yesterday_wake = wake_dt - timedelta(days=1)
-            if current_time > yesterday_wake:
-                time_since_wake = current_time - yesterday_wake
-                return time_since_wake.total_seconds() / 3600
-            return 0
-        
-        time_since_wake = current_time - wake_dt
-        return time_since_wake.total_seconds() / 3600
+        # Before today's wake time this counts from yesterday's
+        return _hours((_time_of_day_us(current_time) - _time_of_day_us(wake_time)) % _US_PER_DAY)
     
     def calculate_time_budget(
         self,
@@ -113,6 +148,22 @@ class OnboardingManager:
         Returns:
             Dictionary with time budget breakdown
         """
+        # The UI rebuilds the summary with the same answers; hand out a copy
+        # of the memoized result so callers can't alter the cached one.
+        return dict(self._time_budget(
+            sleep_hours, has_work, work_hours_per_week, work_days_per_week, wake_time
+        ))
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _time_budget(
+        sleep_hours: float,
+        has_work: bool,
+        work_hours_per_week: float,
+        work_days_per_week: int,
+        wake_time: str
+    ) -> Dict[str, float]:
+        """Pure calculation behind calculate_time_budget (memoized)"""
         
         # Base calculation
         total_hours_per_day = 24.0
@@ -133,8 +184,8 @@ class OnboardingManager:
         free_hours_per_week = free_hours_per_day * 7
         
         # Calculate bedtime
-        wake_time_obj = self.parse_wake_time(wake_time)
-        bedtime_obj = self.calculate_bedtime(wake_time_obj, sleep_hours)
+        wake_time_obj = OnboardingManager.parse_wake_time(wake_time)
+        bedtime_obj = OnboardingManager.calculate_bedtime(wake_time_obj, sleep_hours)
         
         return {
             # Daily breakdown
@@ -199,40 +250,44 @@ class OnboardingManager:
         
         timestamp = datetime.now().isoformat()
         
-        # Update users table with onboarding data
-        self.db.update("users", {
-            "sleep_hours": sleep_hours,
-            "wake_time": wake_time,
-            "has_work": 1 if has_work else 0,
-            "work_hours_per_week": work_hours_per_week,
-            "work_days_per_week": work_days_per_week,
-            "study_goal_hours_per_day": study_goal_hours_per_day,
-            "updated_at": timestamp,
-        }, "id = ?", (user_id,))
-        
-        # Mark onboarding as completed in settings
-        self.db.execute_query("""
-            INSERT OR REPLACE INTO settings (user_id, setting_key, setting_value, updated_at)
-            VALUES (?, ?, ?, ?)
-        """, (user_id, "onboarding_completed", "true", timestamp))
+        # Profile, settings and default budget are committed together
+        with self.db.transaction():
+            # Update users table with onboarding data
+            self.db.update("users", {
+                "sleep_hours": sleep_hours,
+                "wake_time": wake_time,
+                "has_work": 1 if has_work else 0,
+                "work_hours_per_week": work_hours_per_week,
+                "work_days_per_week": work_days_per_week,
+                "study_goal_hours_per_day": study_goal_hours_per_day,
+                "updated_at": timestamp,
+            }, "id = ?", (user_id,))
+            
+            # Mark onboarding as completed in settings
+            self.db.execute_many("""
+                INSERT INTO settings (user_id, setting_key, setting_value, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id, setting_key) DO UPDATE SET
+                    setting_value = excluded.setting_value,
+                    updated_at = excluded.updated_at
+            """, [
+                (user_id, "onboarding_completed", "true", timestamp),
+                (user_id, "onboarding_date", timestamp, timestamp),
+            ])
+            
+            # Create default time budget entry
+            self.db.insert("time_budgets", {
+                "user_id": user_id,
+                "category": "Study",
+                "budget_type": "daily",
+                "budget_hours": study_goal_hours_per_day,
+                "start_date": datetime.now().date().isoformat(),
+                "created_at": timestamp,
+                "updated_at": timestamp,
+            })
 
-        self.db.execute_query("""
-            INSERT OR REPLACE INTO settings (user_id, setting_key, setting_value, updated_at)
-            VALUES (?, ?, ?, ?)
-        """, (user_id, "onboarding_date", timestamp, timestamp))
-        
-        self.db.commit()
-        
-        # Create default time budget entry
-        self.db.insert("time_budgets", {
-            "user_id": user_id,
-            "category": "Study",
-            "budget_type": "daily",
-            "budget_hours": study_goal_hours_per_day,
-            "start_date": datetime.now().date().isoformat(),
-            "created_at": timestamp,
-            "updated_at": timestamp,
-        })
+        self._completed_users.add((self.db.db_path, user_id))
+        self._budget_cache.pop((self.db.db_path, user_id), None)
 
         # Sync user profile and settings to server (best-effort)
         try:
@@ -261,21 +316,56 @@ class OnboardingManager:
             Dictionary with budget info or None if not set up
         """
         
-        # Check if onboarding completed
-        completed = self.db.fetch_one(
-            "SELECT setting_value FROM settings WHERE user_id = ? AND setting_key = ?",
-            (user_id, "onboarding_completed")
-        )
-        
-        if not completed or completed['setting_value'] != 'true':
-            return None
-        
-        # Fetch user data from users table
-        user = self.db.get_by_id("users", user_id)
+        version = self._data_version()
+        cached = self._cached_budget(user_id, version)
+        if cached is not None:
+            return dict(cached[0])
+        
+        # Profile columns for a user who has completed onboarding, in one row
+        user = self.db.fetch_one("""
+            SELECT u.sleep_hours, u.wake_time, u.has_work, u.work_hours_per_week,
+                   u.work_days_per_week, u.study_goal_hours_per_day
+            FROM users u
+            JOIN settings s
+                ON s.user_id = u.id
+                AND s.setting_key = 'onboarding_completed'
+                AND s.setting_value = 'true'
+            WHERE u.id = ?
+        """, (user_id,))
         
         if not user:
             return None
         
+        return dict(self._store_budget(user_id, self._budget_from_profile(user), version))
+    
+    def _cached_budget(self, user_id: int, version: Optional[int]) -> Optional[tuple]:
+        """Return (budget, wake_time) if cached at this db version within the TTL, else None"""
+        if not isinstance(version, int):
+            return None
+        cache_key = (self.db.db_path, user_id)
+        entry = self._budget_cache.get(cache_key)
+        if (
+            entry is None
+            or entry[1] != version
+            or _time.monotonic() - entry[0] >= self.BUDGET_CACHE_TTL_SECONDS
+        ):
+            return None
+        self._budget_cache.move_to_end(cache_key)
+        return entry[2], entry[3]
+    
+    def _store_budget(self, user_id: int, budget: Dict, version: Optional[int]) -> Dict:
+        """Cache a budget built from rows read at the given db version"""
+        if isinstance(version, int):
+            cache = self._budget_cache
+            cache_key = (self.db.db_path, user_id)
+            cache[cache_key] = (_time.monotonic(), version, budget, self.parse_wake_time(budget["wake_time"]))
+            cache.move_to_end(cache_key)
+            while len(cache) > self.BUDGET_CACHE_SIZE:
+                cache.popitem(last=False)
+        return budget
+    
+    def _budget_from_profile(self, user: Dict) -> Dict:
+        """Build the get_user_budget dict from the users profile columns"""
         # Calculate bedtime
         wake_time_obj = self.parse_wake_time(user['wake_time'])
         bedtime_obj = self.calculate_bedtime(wake_time_obj, user['sleep_hours'])
@@ -302,19 +392,21 @@ class OnboardingManager:
             "free_hours_per_week": free_hours_per_day * 7,
         }
     
-    def get_time_spent_today(self, user_id: int) -> Dict[str, float]:
+    def get_time_spent_today(self, user_id: int, today: Optional[str] = None) -> Dict[str, float]:
         """
         Calculate how much time user has spent today
         
         Args:
             user_id: User ID
+            today: Date to total (YYYY-MM-DD), defaults to the current date
             
         Returns:
             Dictionary with time spent by category
         """
-        today = datetime.now().date().isoformat()
+        if today is None:
+            today = datetime.now().date().isoformat()
         
-        # Get time logs for today
+        # One row per category logged today (served by idx_time_logs_user_date)
         time_logs = self.db.fetch_all("""
             SELECT category, SUM(hours) as total_hours
             FROM time_logs
@@ -329,10 +421,10 @@ class OnboardingManager:
             "total": 0.0
         }
         
+        # Every category keeps its own entry so the breakdown adds up to total
         for log in time_logs:
-            category = log['category']
             hours = log['total_hours']
-            result[category] = hours
+            result[log['category']] = hours
             result['total'] += hours
         
         return result
@@ -350,32 +442,52 @@ class OnboardingManager:
         """
         # Get start of week (Monday)
         today = datetime.now().date()
-        start_of_week = today - timedelta(days=today.weekday())
+        week_start = (today - timedelta(days=today.weekday())).isoformat()
         
-        # Try time_logs first
+        # time_logs total and the task session fallback in one round trip
         result = self.db.fetch_one("""
-            SELECT SUM(hours) as total_hours
-            FROM time_logs
-            WHERE user_id = ?
-            AND date >= ?
-        """, (user_id, start_of_week.isoformat()))
-        
-        if result and result["total_hours"]:
+            SELECT
+                (SELECT SUM(hours)
+                 FROM time_logs
+                 WHERE user_id = ?
+                 AND date >= ?) AS total_hours,
+                (SELECT SUM(duration_minutes)
+                 FROM task_sessions
+                 WHERE user_id = ?
+                 AND logged_at >= ?
+                 AND is_deleted = 0) AS total_minutes
+        """, (user_id, week_start, user_id, week_start))
+        
+        # Prefer time_logs; fall back to task session minutes logged this week
+        if result["total_hours"]:
             return result["total_hours"]
-        
-        # Fallback: sum task session minutes logged this week
-        session_minutes = self.db.fetch_one("""
-            SELECT SUM(duration_minutes) as total_minutes
-            FROM task_sessions
-            WHERE user_id = ?
-            AND DATE(logged_at) >= ?
-            AND is_deleted = 0
-        """, (user_id, start_of_week.isoformat()))
-
-        if session_minutes and session_minutes["total_minutes"]:
-            return round(session_minutes["total_minutes"] / 60.0, 2)
+        if result["total_minutes"]:
+            return round(result["total_minutes"] / 60.0, 2)
         return 0.0
     
+    def _fetch_budget_with_today(self, user_id: int, today_iso: str):
+        """Profile columns plus today's pivoted time_logs hours in one row"""
+        return self.db.fetch_one("""
+            SELECT u.sleep_hours, u.wake_time, u.has_work, u.work_hours_per_week,
+                   u.work_days_per_week, u.study_goal_hours_per_day,
+                   t.study_hours, t.work_hours, t.total_hours
+            FROM users u
+            JOIN settings s
+                ON s.user_id = u.id
+                AND s.setting_key = 'onboarding_completed'
+                AND s.setting_value = 'true'
+            LEFT JOIN (
+                SELECT user_id,
+                       SUM(CASE WHEN category = 'Study' THEN hours END) AS study_hours,
+                       SUM(CASE WHEN category = 'Work' THEN hours END) AS work_hours,
+                       SUM(hours) AS total_hours
+                FROM time_logs
+                WHERE user_id = ? AND date = ?
+                GROUP BY user_id
+            ) t ON t.user_id = u.id
+            WHERE u.id = ?
+        """, (user_id, today_iso, user_id))
+    
     def get_remaining_budget(self, user_id: int, current_time: Optional[datetime] = None) -> Dict[str, float]:
         """
         Calculate remaining time budget for today with REAL-TIME AWARENESS
@@ -392,31 +504,54 @@ class OnboardingManager:
         if current_time is None:
             current_time = datetime.now()
         
-        budget = self.get_user_budget(user_id)
-        if not budget:
-            return {"error": "Budget not set up"}
-        
-        spent = self.get_time_spent_today(user_id)
+        # Everything below is measured against this one clock reading
+        today_iso = current_time.date().isoformat()
+        version = self._data_version()
+        cached = self._cached_budget(user_id, version)
+        if cached is not None:
+            # Profile is cached, so only today's logged hours are read
+            budget, wake_time = cached
+            row = self.db.fetch_one("""
+                SELECT SUM(CASE WHEN category = 'Study' THEN hours END) AS study_hours,
+                       SUM(CASE WHEN category = 'Work' THEN hours END) AS work_hours,
+                       SUM(hours) AS total_hours
+                FROM time_logs
+                WHERE user_id = ? AND date = ?
+            """, (user_id, today_iso))
+        else:
+            # Budget profile and today's logged hours in one round trip
+            row = self._fetch_budget_with_today(user_id, today_iso)
+            if not row:
+                return {"error": "Budget not set up"}
+            budget = self._store_budget(user_id, self._budget_from_profile(row), version)
+            wake_time = self.parse_wake_time(budget["wake_time"])
+        
+        spent = {
+            "Study": row["study_hours"] if row["study_hours"] is not None else 0.0,
+            "Work": row["work_hours"] if row["work_hours"] is not None else 0.0,
+            "total": 0.0 + (row["total_hours"] or 0.0),
+        }
         
-        # Parse wake time
-        wake_time = self.parse_wake_time(budget["wake_time"])
         sleep_hours = budget["sleep_hours"]
         
         # Simple and stable model:
         # remaining day time is based on hours until bedtime for the current wake cycle.
-        today = current_time.date()
-        wake_dt_today = datetime.combine(today, wake_time)
-        hours_since_wake = self.get_hours_since_wake(current_time, wake_time)
-        is_before_wake = current_time < wake_dt_today and hours_since_wake <= 0
+        # Times of day are compared as microseconds since midnight, which is
+        # what the naive datetime arithmetic in the static helpers reduces to.
+        now_us = _time_of_day_us(current_time)
+        wake_us = _time_of_day_us(wake_time)
+        since_wake_us = (now_us - wake_us) % _US_PER_DAY
+        hours_since_wake = _hours(since_wake_us)
+        is_before_wake = now_us < wake_us and hours_since_wake <= 0
 
         if is_before_wake:
-            hours_until_wake = (wake_dt_today - current_time).total_seconds() / 3600
+            hours_until_wake = _hours(wake_us - now_us)
             # Before wake, the upcoming day still has full waking hours available.
             hours_until_bedtime = budget["waking_hours_per_day"]
             hours_since_wake = 0.0
         else:
             hours_until_wake = 0.0
-            hours_until_bedtime = self.get_hours_until_bedtime(current_time, wake_time, sleep_hours)
+            hours_until_bedtime = _hours(_waking_us(sleep_hours) - since_wake_us)
         
         # Calculate remaining free time
         free_hours_budget = budget["free_hours_per_day"]
@@ -440,15 +575,10 @@ class OnboardingManager:
         elif hours_until_bedtime <= 0:
             time_status = "Past bedtime! Time to sleep."
             time_status_color = "red"
-        elif hours_until_bedtime < 2:
-            time_status = f"Only {hours_until_bedtime:.1f} hours until bedtime!"
-            time_status_color = "orange"
-        elif hours_until_bedtime < 4:
-            time_status = f"{hours_until_bedtime:.1f} hours remaining today"
-            time_status_color = "yellow"
         else:
-            time_status = f"{hours_until_bedtime:.1f} hours remaining today"
-            time_status_color = "green"
+            bucket = bisect_right(_BEDTIME_THRESHOLDS, hours_until_bedtime)
+            time_status = _BEDTIME_STATUS_TEMPLATES[bucket].format(hours_until_bedtime)
+            time_status_color = _BEDTIME_STATUS_COLORS[bucket]
         
         # Status messages for study progress
         if study_remaining_realistic <= 0:
@@ -514,9 +644,16 @@ class OnboardingManager:
         Returns:
             True if onboarding needed
         """
+        cache_key = (self.db.db_path, user_id)
+        if cache_key in self._completed_users:
+            return False
+        
         completed = self.db.fetch_one(
             "SELECT setting_value FROM settings WHERE user_id = ? AND setting_key = ?",
             (user_id, "onboarding_completed")
         )
         
-        return not completed or completed['setting_value'] != 'true'
\ No newline at end of file
+        if completed and completed['setting_value'] == 'true':
+            self._completed_users.add(cache_key)
+            return False
+        return True
\ No newline at end of file
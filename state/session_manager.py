@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 from typing import List, Optional
 from storage.sqlite import get_database
@@ -167,7 +167,7 @@ class SessionManager:
             """,
             (task_id,),
         )
-        return [Session.from_dict(row) for row in rows]
+        return Session.from_rows(rows)
 
     def get_total_minutes_for_task(self, task_id: int) -> float:
         """Get total minutes for a task by summing sessions."""
@@ -183,18 +183,19 @@ class SessionManager:
 
     def get_sessions_for_user_today(self, user_id: int) -> List[Session]:
         """Fetch today's sessions for a user."""
-        today = datetime.now().date().isoformat()
+        today = datetime.now().date()
+        # Half-open range on the ISO string so idx_task_sessions_user_logged applies
         rows = self.db.fetch_all(
             """
             SELECT * FROM task_sessions
             WHERE user_id = ?
             AND is_deleted = 0
-            AND DATE(logged_at) = ?
+            AND logged_at >= ? AND logged_at < ?
             ORDER BY logged_at ASC
             """,
-            (user_id, today),
+            (user_id, today.isoformat(), (today + timedelta(days=1)).isoformat()),
         )
-        return [Session.from_dict(row) for row in rows]
+        return Session.from_rows(rows)
 
     def get_sessions_for_user(self, user_id: int) -> List[Session]:
         """Fetch all non-deleted sessions for a user."""
@@ -207,7 +208,7 @@ class SessionManager:
             """,
             (user_id,),
         )
-        return [Session.from_dict(row) for row in rows]
+        return Session.from_rows(rows)
 
     def update_session(
         self,
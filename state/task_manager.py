@@ -268,7 +268,8 @@ class TaskManager:
     def get_overdue_tasks(self, user_id: int) -> List[Task]:
         """Get all overdue tasks for a user"""
         all_tasks = self.get_user_tasks(user_id)
-        return [task for task in all_tasks if task.is_overdue()]
+        today = datetime.now().date()
+        return [task for task in all_tasks if task.is_overdue(today)]
     
     def get_upcoming_tasks(self, user_id: int, limit: int = 5) -> List[Task]:
         """Get upcoming tasks (not completed, sorted by due date)"""
@@ -297,6 +298,7 @@ class TaskManager:
         
         tasks = self.get_user_tasks(user_id)
         stats["total"] = len(tasks)
+        today = datetime.now().date()
         
         for task in tasks:
             if task.status == "Completed":
@@ -306,7 +308,7 @@ class TaskManager:
             elif task.status == "Not Started":
                 stats["not_started"] += 1
             
-            if task.is_overdue():
+            if task.is_overdue(today):
                 stats["overdue"] += 1
         
         return stats
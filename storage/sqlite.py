@@ -6,6 +6,7 @@ import os
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 import threading
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
 # Load environment variables from .env if present
@@ -14,6 +15,8 @@ load_dotenv()
 class Database:
     """ TYMATE SQLite Database Handler """
     
+    STATEMENT_CACHE_SIZE = 256
+    
     def __init__(self, db_path: str = None):
         """
         Initialize database connection and create tables if needed
@@ -27,7 +30,8 @@ class Database:
         
         self.db_path = resolved_path
         self.connection = None
-        self._lock = threading.Lock()  # Lock for thread-safe database access
+        self._lock = threading.RLock()  # Lock for thread-safe database access
+        self._transaction_depth = 0  # > 0 while inside transaction()
         
         # Connect and initialize tables
         self.connect()
@@ -35,7 +39,13 @@ class Database:
     
     def connect(self):
         """Establish database connection with optional encryption"""
-        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Analytics and dashboard queries are fixed strings; a larger statement
+        # cache keeps all of them compiled on the shared connection.
+        self.connection = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+        )
         self.connection.row_factory = sqlite3.Row  # Enable column access by name
         
         # Enable SQLCipher encryption if password is provided
@@ -51,6 +61,24 @@ class Database:
                 print(f"⚠️ Warning: Failed to enable database encryption: {e}")
                 print("Database will be created without encryption. Set TYMATE_DB_PASSWORD for encryption.")
 
+        self._apply_pragmas()
+
+    def _apply_pragmas(self):
+        """Tune the connection for the app's read-heavy workload (must run after PRAGMA key)"""
+        try:
+            # WAL lets reads proceed while a write is in progress; NORMAL sync is
+            # durable across app crashes in WAL mode and avoids an fsync per commit.
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+            self.connection.execute("PRAGMA temp_store = MEMORY")
+            self.connection.execute("PRAGMA mmap_size = 268435456")
+            self.connection.execute("PRAGMA cache_size = -20000")
+            # Wait for another process's write lock (e.g. a second app window or
+            # a maintenance script) instead of failing with "database is locked".
+            self.connection.execute("PRAGMA busy_timeout = 30000")
+        except sqlite3.DatabaseError as e:
+            print(f"⚠️ Warning: Failed to apply database pragmas: {e}")
+
     def close(self):
         """Close database connection"""
         if self.connection:
@@ -347,6 +375,12 @@ class Database:
             )
         """)
 
+        # Covers the per-day class lookup (WHERE user_id, day_of_week ORDER BY start_time)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_class_user_day_start
+            ON class_schedule (user_id, day_of_week, start_time)
+        """)
+
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS work_schedule (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -364,12 +398,60 @@ class Database:
 
         self._migrate_tasks_date_due_nullable()
         self._migrate_tasks_recurring_columns()
+
+        # Indexes on tasks are created after the migrations above, which may
+        # rebuild the tasks table and would drop them.
+        self._create_analytics_indexes()
+        self._create_auth_indexes()
         
         self.connection.commit()
         
         # Seed default roles
         self._seed_roles()
     
+    def _create_analytics_indexes(self):
+        """Indexes backing the per-user task, session and time log filters used by analytics"""
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_user_given
+            ON tasks (user_id, is_deleted, date_given)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_user_completed
+            ON tasks (user_id, status, completed_at)
+            WHERE is_deleted = 0
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_task_sessions_task
+            ON task_sessions (task_id, is_deleted)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_task_sessions_user_logged
+            ON task_sessions (user_id, logged_at)
+        """)
+        # Covers the dashboard's per-day category sums without touching the table
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_time_logs_user_date
+            ON time_logs (user_id, date, category, hours)
+        """)
+    
+    def _create_auth_indexes(self):
+        """
+        Indexes for the login history and audit log screens
+
+        users.username, sessions.session_token and settings(user_id, setting_key)
+        are already indexed by their UNIQUE constraints.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_login_attempts_user_time
+            ON login_attempts (username, timestamp)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp
+            ON audit_logs (timestamp)
+        """)
+    
     def _seed_roles(self):
         """Seed default roles for RBAC (CS 319 requirement)"""
         roles_data = [
@@ -485,6 +567,13 @@ class Database:
             cursor.execute(query, params)
             return cursor
 
+    def execute_many(self, query: str, params_seq) -> sqlite3.Cursor:
+        """Execute one SQL statement for each parameter tuple"""
+        with self._lock:
+            cursor = self.connection.cursor()
+            cursor.executemany(query, params_seq)
+            return cursor
+
     def fetch_one(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
         """Execute query and fetch one result"""
         with self._lock:
@@ -510,7 +599,7 @@ class Database:
         with self._lock:
             cursor = self.connection.cursor()
             cursor.execute(query, tuple(data.values()))
-            self.connection.commit()
+            self._commit_unless_in_transaction()
             return cursor.lastrowid
 
     def update(self, table: str, data: Dict[str, Any], where: str, where_params: tuple = ()) -> int:
@@ -522,7 +611,7 @@ class Database:
         with self._lock:
             cursor = self.connection.cursor()
             cursor.execute(query, params)
-            self.connection.commit()
+            self._commit_unless_in_transaction()
             return cursor.rowcount
 
     def delete(self, table: str, where: str, where_params: tuple = ()) -> int:
@@ -532,7 +621,7 @@ class Database:
         with self._lock:
             cursor = self.connection.cursor()
             cursor.execute(query, where_params)
-            self.connection.commit()
+            self._commit_unless_in_transaction()
             return cursor.rowcount
 
     def get_by_id(self, table: str, record_id: int) -> Optional[Dict[str, Any]]:
@@ -549,6 +638,35 @@ class Database:
         result = self.fetch_one(query, where_params)
         return result['count'] if result else 0
     
+    def _commit_unless_in_transaction(self):
+        """Commit a single write, or leave it to the enclosing transaction()"""
+        if self._transaction_depth == 0:
+            self.connection.commit()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one commit
+
+        insert/update/delete inside the block skip their own commit; the
+        outermost block commits on success and rolls back on any exception.
+        Other threads wait until the block finishes.
+        """
+        with self._lock:
+            if self._transaction_depth == 0 and not self.connection.in_transaction:
+                self.connection.execute("BEGIN IMMEDIATE")
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self.connection.rollback()
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.connection.commit()
+
     def commit(self):
         """Commit current transaction"""
         with self._lock:
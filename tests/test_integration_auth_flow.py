@@ -45,6 +45,35 @@ class AuthFlowIntegrationTest(unittest.TestCase):
         self.assertIsNotNone(session_user)
         self.assertEqual(session_user.username, "flowuser")
 
+    def test_session_lookup_reflects_profile_changes_and_logout(self):
+        """Test repeated session lookups stay in sync with writes"""
+        ok, msg, _ = self.auth.register_user(username="cacheuser", password="cachepass123")
+        self.assertTrue(ok, msg)
+        ok, msg, user, token = self.auth.login("cacheuser", "cachepass123")
+        self.assertTrue(ok, msg)
+
+        self.assertEqual(self.auth.get_user_by_session(token).username, "cacheuser")
+        self.assertEqual(self.auth.get_user_by_session(token).username, "cacheuser")
+
+        ok, msg = self.auth.update_user_profile(user.id, full_name="Cache User")
+        self.assertTrue(ok, msg)
+        self.assertEqual(self.auth.get_user_by_session(token).full_name, "Cache User")
+
+        self.auth.logout(token)
+        self.assertIsNone(self.auth.get_user_by_session(token))
+
+    def test_session_lookup_debounces_last_activity_write(self):
+        """Test lookups right after login do not rewrite last_activity"""
+        ok, msg, _ = self.auth.register_user(username="idleuser", password="idlepass123")
+        self.assertTrue(ok, msg)
+        ok, msg, _, token = self.auth.login("idleuser", "idlepass123")
+        self.assertTrue(ok, msg)
+
+        changes = self.auth.db.connection.total_changes
+        self.assertIsNotNone(self.auth.get_user_by_session(token))
+        self.assertIsNotNone(self.auth.get_user_by_session(token))
+        self.assertEqual(self.auth.db.connection.total_changes, changes)
+
     def test_account_lockout_after_failures(self):
         """Test account lockout after max failed login attempts"""
         ok, msg, user = self.auth.register_user(username="lockme", password="lockpass123")
@@ -62,6 +91,24 @@ class AuthFlowIntegrationTest(unittest.TestCase):
         self.assertFalse(ok)
         self.assertIn("locked", msg.lower())
 
+    def test_transaction_rolls_back_all_writes_on_error(self):
+        """Test grouped writes are discarded together when one fails"""
+        db = self.auth.db
+        before = db.count("audit_logs")
+
+        with self.assertRaises(RuntimeError):
+            with db.transaction():
+                self.auth._log_audit(None, "TEST", "users", None)
+                with db.transaction():
+                    self.auth._log_audit(None, "TEST", "users", None)
+                raise RuntimeError("boom")
+
+        self.assertEqual(db.count("audit_logs"), before)
+
+        with db.transaction():
+            self.auth._log_audit(None, "TEST", "users", None)
+        self.assertEqual(db.count("audit_logs"), before + 1)
+
     def test_task_creation_and_lifecycle(self):
         """Test task creation, status updates, and completion workflow"""
         # Register and login user
@@ -1,3 +1,4 @@
+import itertools
 import sqlite3
 import unittest
 from datetime import date
@@ -6,10 +7,15 @@ from unittest.mock import patch
 from managers.schedule_manager import ScheduleManager
 
 
+_db_ids = itertools.count()
+
+
 class InMemoryDB:
     """Minimal DB adapter matching the methods used by ScheduleManager."""
 
     def __init__(self):
+        # Distinct per instance, like a real database file path
+        self.db_path = f":memory:{next(_db_ids)}"
         self.connection = sqlite3.connect(":memory:")
         self.connection.row_factory = sqlite3.Row
         self._create_schema()
@@ -164,6 +170,44 @@ class TestScheduleManager(unittest.TestCase):
         free_minutes = self.manager.compute_free_time_today(1, date(2026, 2, 23))
         self.assertEqual(free_minutes, 750)
 
+    def test_compute_free_time_today_nested_and_disjoint_blocks(self):
+        for start, end in (("08:00", "12:00"), ("09:00", "10:00"), ("13:00", "14:30")):
+            self.manager.add_class_block(
+                user_id=1,
+                day_of_week=0,
+                start_time=start,
+                end_time=end,
+                course_name="Block",
+            )
+
+        # 08:00-12:00 swallows 09:00-10:00 -> 240, plus 13:00-14:30 -> 90
+        # Free = 960 - 330 - 90 = 540
+        free_minutes = self.manager.compute_free_time_today(1, date(2026, 2, 23))
+        self.assertEqual(free_minutes, 540)
+
+    def test_compute_free_time_today_cache_refreshes_after_schedule_change(self):
+        monday = date(2026, 2, 23)
+        self.assertEqual(self.manager.compute_free_time_today(1, monday), 870)
+
+        # Views build their own managers; writes through one must reach the others
+        other_manager = ScheduleManager()
+        ok, msg, block_id = other_manager.add_class_block(
+            user_id=1,
+            day_of_week=0,
+            start_time="09:00",
+            end_time="10:00",
+            course_name="Bio",
+        )
+        self.assertTrue(ok, msg)
+        self.assertEqual(self.manager.compute_free_time_today(1, monday), 810)
+
+        other_manager.delete_class_block(block_id)
+        self.assertEqual(self.manager.compute_free_time_today(1, monday), 870)
+
+        self.db.connection.execute("UPDATE users SET sleep_hours = 9.0 WHERE id = 1")
+        self.db.connection.commit()
+        self.assertEqual(ScheduleManager().compute_free_time_today(1, monday), 810)
+
     def test_delete_class_block_removes_block(self):
         ok, msg, block_id = self.manager.add_class_block(
             user_id=1,
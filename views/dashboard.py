@@ -56,7 +56,8 @@ def DashboardPage(page: ft.Page, session: dict = None):
     }
     
     # Calculate remaining budget for today using REAL-TIME logic
-    time_spent_today = onboarding_mgr.get_time_spent_today(user_id) if user_id else {
+    current_time = datetime.now()
+    time_spent_today = onboarding_mgr.get_time_spent_today(user_id, current_time.date().isoformat()) if user_id else {
         "Study": 0.0,
         "Work": 0.0,
         "Personal": 0.0,
@@ -67,7 +68,6 @@ def DashboardPage(page: ft.Page, session: dict = None):
     free_hours = budget.get("free_hours_per_day", 16.0)
 
     # Calculate realistic remaining time
-    current_time = datetime.now()
     remaining = onboarding_mgr.get_remaining_budget(user_id, current_time) if user_id else None
     if not remaining or "error" in remaining:
         wake_obj = onboarding_mgr.parse_wake_time(budget.get("wake_time", "07:00"))
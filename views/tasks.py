@@ -52,6 +52,8 @@ def TasksPage(page: ft.Page, session: dict = None):
     
     # Track current tasks for responsive rebuild
     current_tasks = []
+    # Rendered task rows keyed by task id; see get_task_card.
+    task_card_cache = {}
     
     def go_to(route: str):
         page.route = route
@@ -203,15 +205,14 @@ def TasksPage(page: ft.Page, session: dict = None):
                 continue
         return None, f"{label} must be in MM-DD-YYYY format"
 
-    def is_in_current_due_filter(task):
+    def is_in_current_due_filter(task, today):
         """Return True if task matches the selected due-date window."""
-        due_date = parse_due_date(task)
         if current_filter == "all":
             return True
+        due_date = parse_due_date(task)
         if due_date is None:
             return False
 
-        today = datetime.now().date()
         if current_filter == "today":
             return due_date == today
         if current_filter == "week":
@@ -246,7 +247,8 @@ def TasksPage(page: ft.Page, session: dict = None):
             tasks = task_manager.get_user_tasks(user_id, include_deleted=False)
 
         # Apply due-date filtering
-        tasks = [t for t in tasks if is_in_current_due_filter(t)]
+        today = datetime.now().date()
+        tasks = [t for t in tasks if is_in_current_due_filter(t, today)]
 
         # Optionally hide completed tasks for non-overdue views.
         if current_filter != "overdue" and not show_completed:
@@ -292,7 +294,7 @@ def TasksPage(page: ft.Page, session: dict = None):
             nonlocal current_tasks
             current_tasks = tasks
             for task in tasks:
-                task_list_container.controls.append(create_task_card(task))
+                task_list_container.controls.append(get_task_card(task, today))
 
         # Update filter tabs to reflect current selection
         update_filter_tabs()
@@ -320,7 +322,7 @@ def TasksPage(page: ft.Page, session: dict = None):
             filter_tabs_container.update()
 
     
-    def create_task_card(task):
+    def create_task_card(task, is_overdue):
         """Create compact task row for quick scanning. Details are in the task detail page."""
         if task.date_due:
             try:
@@ -329,7 +331,6 @@ def TasksPage(page: ft.Page, session: dict = None):
                 due_text = task.date_due
         else:
             due_text = "No due"
-        is_overdue = task.is_overdue()
         est_text = format_minutes(task.estimated_time) if task.estimated_time is not None else "-"
         status_chip_bg = {
             "Completed": "#6DAF74",
@@ -409,6 +410,17 @@ def TasksPage(page: ft.Page, session: dict = None):
             margin=ft.margin.only(bottom=6),
         )
     
+    def get_task_card(task, today):
+        """Reuse the card built for this task while its displayed fields are unchanged."""
+        is_overdue = task.is_overdue(today)
+        key = (task.title, task.category, task.status, task.date_due, task.estimated_time, is_overdue)
+        cached = task_card_cache.get(task.id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        card = create_task_card(task, is_overdue)
+        task_card_cache[task.id] = (key, card)
+        return card
+
     def show_task_form(task=None):
         """Unified create/edit task form with date pickers and inline validation."""
         is_edit = task is not None
@@ -885,8 +897,9 @@ def TasksPage(page: ft.Page, session: dict = None):
                 )
             )
         else:
+            today = datetime.now().date()
             for task in current_tasks:
-                task_list_container.controls.append(create_task_card(task))
+                task_list_container.controls.append(get_task_card(task, today))
         task_list_container.update()
     
     # Handle window resize for responsive layout